@@ -3,13 +3,14 @@ Document Classification Package
 
 Provides implementations of document classifiers and related utilities.
 """
-from .base import BaseDocumentClassifier, ClassificationResult
+from .base import BaseDocumentClassifier, ClassificationBatch, ClassificationResult
 from .docling import DoclingClassifier
 from .gemini import GeminiClassifier
 from .factory import ClassifierFactory
 
 __all__ = [
     'BaseDocumentClassifier',
+    'ClassificationBatch',
     'ClassificationResult',
     'DoclingClassifier',
     'GeminiClassifier',
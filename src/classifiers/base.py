@@ -5,10 +5,26 @@ This module defines the base interface that all document classifiers must implem
 Supports hot-swapping of different classification implementations.
 """
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Dict, List, Union, Optional
 from pathlib import Path
+import numpy as np
 from pydantic import BaseModel
 
+# Warning flags in bit order; FLAG_TABLE maps every presence mask to its flags
+FLAG_NAMES = (
+    'LOW_CONFIDENCE',
+    'MISSING_DOCUMENT_TYPE',
+    'NO_ENTITIES_FOUND',
+    'NO_DATES_FOUND',
+    'NO_REGISTRATION_NUMBERS',
+    'NO_PRODUCT_CATEGORY_MATCH',
+)
+FLAG_TABLE = tuple(
+    tuple(name for bit, name in enumerate(FLAG_NAMES) if mask >> bit & 1)
+    for mask in range(1 << len(FLAG_NAMES))
+)
+
 class ClassificationResult(BaseModel):
     """Standardized classification result model."""
     document_type: str | None
@@ -20,6 +36,43 @@ class ClassificationResult(BaseModel):
     summary: str | None
     flags: List[str]
 
+@dataclass
+class ClassificationBatch:
+    """Column-oriented view of a batch of classification results.
+    
+    Numeric fields are stored as parallel NumPy arrays so batch-level
+    metrics are single vectorized reductions instead of loops over results.
+    """
+    confidences: np.ndarray
+    entity_counts: np.ndarray
+    field_counts: np.ndarray
+    document_types: List[Optional[str]]
+    flags: List[List[str]]
+    
+    @classmethod
+    def from_results(cls, results: List[ClassificationResult]) -> "ClassificationBatch":
+        """Build the columnar view in a single pass over the results."""
+        count = len(results)
+        confidences = np.empty(count, dtype=np.float32)
+        entity_counts = np.empty(count, dtype=np.int32)
+        field_counts = np.empty(count, dtype=np.int32)
+        document_types = []
+        flags = []
+        for i, result in enumerate(results):
+            confidences[i] = result.confidence
+            entity_counts[i] = sum(map(len, result.entities.values()))
+            field_counts[i] = sum(map(len, result.key_fields.values()))
+            document_types.append(result.document_type)
+            flags.append(result.flags)
+        return cls(confidences, entity_counts, field_counts, document_types, flags)
+    
+    def __len__(self) -> int:
+        return len(self.document_types)
+    
+    def low_confidence(self, threshold: float = 0.5) -> np.ndarray:
+        """Return indices of results with confidence below the threshold."""
+        return np.flatnonzero(self.confidences < threshold)
+
 class BaseDocumentClassifier(ABC):
     """Abstract base class for document classifiers."""
     
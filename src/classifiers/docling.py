@@ -10,7 +10,7 @@ import asyncio
 import json
 import io
 from docling import DocProcessor, TableFormer  # Note: Package name may differ
-from .base import BaseDocumentClassifier, ClassificationResult
+from .base import FLAG_TABLE, BaseDocumentClassifier, ClassificationResult
 from .domain_config import DomainConfig
 
 class DoclingClassifier(BaseDocumentClassifier):
@@ -74,26 +74,25 @@ class DoclingClassifier(BaseDocumentClassifier):
                            metadata: Optional[List[Dict]] = None,
                            max_concurrent: int = 5) -> List[ClassificationResult]:
         """Classify multiple documents concurrently."""
-        results = []
         metadata_list = metadata or [None] * len(sources)
+        semaphore = asyncio.Semaphore(max_concurrent)
         
-        for i in range(0, len(sources), max_concurrent):
-            batch_sources = sources[i:i + max_concurrent]
-            batch_metadata = metadata_list[i:i + max_concurrent]
-            tasks = [
-                self.classify_document(source, source_type, md) 
-                for source, md in zip(batch_sources, batch_metadata)
-            ]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle any exceptions in the batch
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    results.append(self._create_error_result(str(result)))
-                else:
-                    results.append(result)
-                    
-        return results
+        async def classify_one(source, md):
+            async with semaphore:
+                return await self.classify_document(source, source_type, md)
+                
+        # Start every document at once; the semaphore keeps max_concurrent in
+        # flight so one slow document never holds back the rest
+        results = await asyncio.gather(
+            *(classify_one(source, md) for source, md in zip(sources, metadata_list)),
+            return_exceptions=True
+        )
+        
+        # Handle any exceptions in the batch
+        return [
+            self._create_error_result(str(result)) if isinstance(result, Exception) else result
+            for result in results
+        ]
 
     def _process_bytes(self, content: bytes) -> Dict:
         """Process document from bytes."""
@@ -319,32 +318,16 @@ class DoclingClassifier(BaseDocumentClassifier):
     
     def _generate_flags(self, result: Dict, confidence: float) -> List[str]:
         """Generate warning flags based on classification results."""
-        flags = []
-        
-        # Check confidence
-        if confidence < 0.5:
-            flags.append('LOW_CONFIDENCE')
-            
-        # Check for missing critical information
-        if not result.get("document_type"):
-            flags.append('MISSING_DOCUMENT_TYPE')
-            
-        # Check entities
-        if not any(result.get("entities", {}).values()):
-            flags.append('NO_ENTITIES_FOUND')
-            
-        # Check key fields
         key_fields = result.get("key_fields", {})
-        if not key_fields.get("dates"):
-            flags.append('NO_DATES_FOUND')
-        if not key_fields.get("registration_numbers"):
-            flags.append('NO_REGISTRATION_NUMBERS')
-            
-        # Add domain-specific flags
-        if not result.get("metadata", {}).get("product_categories"):
-            flags.append('NO_PRODUCT_CATEGORY_MATCH')
-            
-        return flags
+        mask = (
+            (confidence < 0.5)
+            | (not result.get("document_type")) << 1
+            | (not any(result.get("entities", {}).values())) << 2
+            | (not key_fields.get("dates")) << 3
+            | (not key_fields.get("registration_numbers")) << 4
+            | (not result.get("metadata", {}).get("product_categories")) << 5
+        )
+        return list(FLAG_TABLE[mask])
     
     def _create_error_result(self, error_message: str) -> ClassificationResult:
         """Create a ClassificationResult for error cases."""
@@ -146,6 +146,13 @@ class DomainConfig:
             self.patterns["companies"][code] = re.compile(
                 f"(?i)\\b({pattern})\\b"
             )
+        
+        # Single alternation over all client codes so code lookup is one scan
+        # of the text; longest codes first so overlapping codes prefer the longer
+        codes = sorted(self.client_data, key=len, reverse=True)
+        self.client_code_pattern = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, codes)) + r")\b"
+        ) if codes else None
     
     def get_document_type(self, text: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -335,10 +342,12 @@ class DomainConfig:
                     return code, 0.95
                     
         # Check code patterns (e.g., "EEA", "ARB")
-        for code, data in self.client_data.items():
-            if re.search(rf"\b{code}\b", text):
-                logger.debug(f"Found code pattern match: {code}")
-                return code, 0.8
+        if self.client_code_pattern is not None:
+            found_codes = {m.group(0) for m in self.client_code_pattern.finditer(text)}
+            for code in self.client_data:
+                if code in found_codes:
+                    logger.debug(f"Found code pattern match: {code}")
+                    return code, 0.8
                 
         # Check compiled patterns for partial matches
         logger.debug("Checking compiled patterns:")
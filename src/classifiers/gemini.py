@@ -5,17 +5,27 @@ import os
 from typing import Dict, List, Optional, Union, Tuple
 import google.generativeai as genai
 from pathlib import Path
-import json
+import orjson
 import asyncio
 import io
 import base64
 import mimetypes
-from .base import BaseDocumentClassifier, ClassificationResult
+from .base import FLAG_TABLE, BaseDocumentClassifier, ClassificationResult
 from .domain_config import DomainConfig
 
 class GeminiClassifier(BaseDocumentClassifier):
     """Document classifier using Google's Gemini Flash model."""
     
+    # Weight of each extracted field in the base confidence score
+    CONFIDENCE_WEIGHTS = (
+        ('document_type', 0.3),
+        ('entities', 0.2),
+        ('key_fields', 0.3),
+        ('tables', 0.1),
+        ('summary', 0.1),
+    )
+    NESTED_FIELDS = frozenset({'entities', 'key_fields'})
+    
     def __init__(self, api_key: Optional[str] = None, config_dir: Optional[Path] = None):
         """
         Initialize the Gemini classifier.
@@ -90,26 +100,25 @@ class GeminiClassifier(BaseDocumentClassifier):
                            metadata: Optional[List[Dict]] = None,
                            max_concurrent: int = 5) -> List[ClassificationResult]:
         """Classify multiple documents concurrently."""
-        results = []
         metadata_list = metadata or [None] * len(sources)
+        semaphore = asyncio.Semaphore(max_concurrent)
         
-        for i in range(0, len(sources), max_concurrent):
-            batch_sources = sources[i:i + max_concurrent]
-            batch_metadata = metadata_list[i:i + max_concurrent]
-            tasks = [
-                self.classify_document(source, source_type, md) 
-                for source, md in zip(batch_sources, batch_metadata)
-            ]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle any exceptions in the batch
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    results.append(self._create_error_result(str(result)))
-                else:
-                    results.append(result)
-                    
-        return results
+        async def classify_one(source, md):
+            async with semaphore:
+                return await self.classify_document(source, source_type, md)
+                
+        # Start every document at once; the semaphore keeps max_concurrent in
+        # flight so one slow document never holds back the rest
+        results = await asyncio.gather(
+            *(classify_one(source, md) for source, md in zip(sources, metadata_list)),
+            return_exceptions=True
+        )
+        
+        # Handle any exceptions in the batch
+        return [
+            self._create_error_result(str(result)) if isinstance(result, Exception) else result
+            for result in results
+        ]
         
     async def _process_binary_content(self, content: bytes, mime_type: str) -> Dict:
         """Process binary content with Gemini Vision."""
@@ -152,8 +161,8 @@ class GeminiClassifier(BaseDocumentClassifier):
         
         # Parse and validate the response
         try:
-            return json.loads(response.text)
-        except json.JSONDecodeError:
+            return orjson.loads(response.text)
+        except orjson.JSONDecodeError:
             raise ValueError("Failed to parse Gemini response as JSON")
             
     async def _process_text_content(self, content: str, model) -> Dict:
@@ -173,7 +182,7 @@ class GeminiClassifier(BaseDocumentClassifier):
                 "amounts": ["Any monetary amounts or quantities"]
             }},
             "summary": "A brief summary of the text's purpose and content",
-            "text": {json.dumps(content)}
+            "text": {orjson.dumps(content).decode()}
         }}
         
         Please be precise and only include information that is explicitly present in the text.
@@ -183,8 +192,8 @@ class GeminiClassifier(BaseDocumentClassifier):
         response = await model.generate_content(prompt)
         
         try:
-            return json.loads(response.text)
-        except json.JSONDecodeError:
+            return orjson.loads(response.text)
+        except orjson.JSONDecodeError:
             raise ValueError("Failed to parse Gemini response as JSON")
             
     def _enhance_with_metadata(self, raw_result: Dict, metadata: Dict) -> Dict:
@@ -270,8 +279,8 @@ class GeminiClassifier(BaseDocumentClassifier):
         # Add domain-specific metadata
         metadata = {
             'has_tables': bool(raw_result.get('tables')),
-            'entity_count': sum(len(v) for v in entities.values()),
-            'field_count': sum(len(v) for v in key_fields.values()),
+            'entity_count': sum(map(len, entities.values())),
+            'field_count': sum(map(len, key_fields.values())),
             'classifier': self.get_classifier_info()['name'],
             'domain_confidence': domain_confidence,
             'product_categories': self.domain_config.get_product_categories(doc_text),
@@ -295,23 +304,14 @@ class GeminiClassifier(BaseDocumentClassifier):
         score = 0.0
         total_weights = 0.0
         
-        weights = {
-            'document_type': 0.3,
-            'entities': 0.2,
-            'key_fields': 0.3,
-            'tables': 0.1,
-            'summary': 0.1
-        }
-        
-        for field, weight in weights.items():
-            if field in result and result[field]:
-                if field in ['entities', 'key_fields']:
-                    # Check if any subfields have content
-                    has_content = any(result[field].values())
-                    score += weight if has_content else 0
-                else:
-                    score += weight
-                total_weights += weight
+        for field, weight in self.CONFIDENCE_WEIGHTS:
+            value = result.get(field)
+            if not value:
+                continue
+            # Nested fields only score if any subfield has content
+            if field not in self.NESTED_FIELDS or any(value.values()):
+                score += weight
+            total_weights += weight
                 
         return round(score / total_weights, 2) if total_weights > 0 else 0.0
         
@@ -345,33 +345,17 @@ class GeminiClassifier(BaseDocumentClassifier):
         
     def _generate_flags(self, result: Dict, confidence: float) -> List[str]:
         """Generate warning flags based on the classification results."""
-        flags = []
-        
-        # Check confidence
-        if confidence < 0.5:
-            flags.append('LOW_CONFIDENCE')
-            
-        # Check for missing critical information
-        if not result.get('document_type'):
-            flags.append('MISSING_DOCUMENT_TYPE')
-            
-        # Check entities
-        if not any(result.get('entities', {}).values()):
-            flags.append('NO_ENTITIES_FOUND')
-            
-        # Check key fields
         key_fields = result.get('key_fields', {})
-        if not key_fields.get('dates'):
-            flags.append('NO_DATES_FOUND')
-        if not key_fields.get('registration_numbers'):
-            flags.append('NO_REGISTRATION_NUMBERS')
-            
-        # Add domain-specific flags
         doc_text = result.get('text', '')
-        if not self.domain_config.get_product_categories(doc_text):
-            flags.append('NO_PRODUCT_CATEGORY_MATCH')
-            
-        return flags
+        mask = (
+            (confidence < 0.5)
+            | (not result.get('document_type')) << 1
+            | (not any(result.get('entities', {}).values())) << 2
+            | (not key_fields.get('dates')) << 3
+            | (not key_fields.get('registration_numbers')) << 4
+            | (not self.domain_config.get_product_categories(doc_text)) << 5
+        )
+        return list(FLAG_TABLE[mask])
         
     def _create_error_result(self, error_message: str) -> ClassificationResult:
         """Create a ClassificationResult instance for error cases."""
@@ -19,13 +19,14 @@ import mimetypes
 import os
 import re
 import threading
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 import dateutil.parser as parser
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from httplib2 import Http
+from lxml import etree
+import lxml.html
 from oauth2client import client, file, tools
 from oauth2client.clientsecrets import InvalidClientSecretsError
 
@@ -34,6 +35,12 @@ from simplegmail.attachment import Attachment
 from simplegmail.label import Label
 from simplegmail.message import Message
 
+# Gmail HTML parts are decoded as UTF-8 regardless of any declared charset
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Characters the HTML parser treats as whitespace
+_HTML_WHITESPACE = ' \t\n\r\f'
+
 
 class Gmail(object):
     """
@@ -52,6 +59,9 @@ class Gmail(object):
 
     """
 
+    # Gmail advises at most 50 requests per batch to avoid rate limiting.
+    _MAX_BATCH_REQUESTS = 50
+
     # Allow Gmail to read and write emails, and access settings like aliases.
     _SCOPES = [
         'https://www.googleapis.com/auth/gmail.modify',
@@ -193,6 +203,33 @@ class Gmail(object):
         Returns:
             A list of message objects.
 
+        Raises:
+            googleapiclient.errors.HttpError: There was an error executing the HTTP request.
+        """
+        return [
+            message
+            for page in self.iter_unread_inbox(user_id, query, attachments)
+            for message in page
+        ]
+
+    def iter_unread_inbox(
+        self,
+        user_id: str = 'me',
+        query: str = '',
+        attachments: str = 'reference'
+    ) -> Iterator[List[Message]]:
+        """
+        Gets unread messages from your inbox one result page at a time, so
+        callers can start on the first page while later ones are fetched.
+
+        Args:
+            user_id: The user's email address. By default, the authenticated user.
+            query: A Gmail query to match.
+            attachments: How to handle attachments ('ignore', 'reference', 'download')
+
+        Yields:
+            A list of message objects per result page.
+
         Raises:
             googleapiclient.errors.HttpError: There was an error executing the HTTP request.
         """
@@ -201,34 +238,21 @@ class Gmail(object):
         if query:
             q = f"{q} {query}"
 
-        try:
-            # Get message list
+        page_token = None
+        while True:
+            request_args = {'pageToken': page_token} if page_token else {}
             response = self.service.users().messages().list(
                 userId=user_id,
                 q=q,
-                includeSpamTrash=False
+                includeSpamTrash=False,
+                **request_args
             ).execute()
-            
-            messages = []
-            if 'messages' in response:
-                for msg_ref in response['messages']:
-                    try:
-                        full_msg = self.service.users().messages().get(
-                            userId=user_id,
-                            id=msg_ref['id'],
-                            format='full'
-                        ).execute()
-                        if not full_msg.get('threadId'):
-                            full_msg['threadId'] = msg_ref.get('threadId', '')
-                        messages.append(self._build_message_from_response(full_msg))
-                    except HttpError as e:
-                        print(f"Error fetching message {msg_ref['id']}: {e}")
-                        continue
-            
-            return messages
-            
-        except HttpError as error:
-            raise error
+
+            yield self._get_messages_from_list(user_id, response.get('messages', []))
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
 
     def get_starred_messages(
         self,
@@ -572,12 +596,9 @@ class Gmail(object):
             if msg_ids:
                 # If specific message IDs are provided, retrieve those messages
                 messages = []
-                for msg_id in msg_ids:
-                    msg = self.service.users().messages().get(
-                        userId=user_id,
-                        id=msg_id,
-                        format='full'
-                    ).execute()
+                for msg, error in self._get_full_messages(user_id, msg_ids):
+                    if error is not None:
+                        raise error
                     messages.append(self._build_message_from_response(msg))
                 return messages
             
@@ -599,24 +620,9 @@ class Gmail(object):
                     includeSpamTrash=include_spam_trash
                 ).execute()
                 
-                messages = []
-                if 'messages' in response:
-                    for msg_ref in response['messages']:
-                        try:
-                            full_msg = self.service.users().messages().get(
-                                userId=user_id,
-                                id=msg_ref['id'],
-                                format='full'
-                            ).execute()
-                            if not full_msg.get('threadId'):
-                                full_msg['threadId'] = msg_ref.get('threadId', '')
-                            messages.append(self._build_message_from_response(full_msg))
-                        except HttpError as e:
-                            # Log error but continue with other messages
-                            print(f"Error fetching message {msg_ref['id']}: {e}")
-                            continue
-                
-                return messages
+                return self._get_messages_from_list(
+                    user_id, response.get('messages', [])
+                )
             except HttpError as error:
                 print(f"Error listing messages: {error}")
                 return []
@@ -743,6 +749,78 @@ class Gmail(object):
             # Pass along the error
             raise error
 
+    def _get_messages_from_list(
+        self,
+        user_id: str,
+        msg_refs: List[dict]
+    ) -> List[Message]:
+        """
+        Builds Message objects for the references returned by
+        messages().list(), skipping any message that fails to fetch.
+
+        Args:
+            user_id: The user's email address.
+            msg_refs: Message references with keys id and threadId.
+
+        Returns:
+            A list of Message objects.
+
+        """
+
+        messages = []
+        full_msgs = self._get_full_messages(
+            user_id, [msg_ref['id'] for msg_ref in msg_refs]
+        )
+        for msg_ref, (full_msg, error) in zip(msg_refs, full_msgs):
+            if error is not None:
+                # Log error but continue with other messages
+                print(f"Error fetching message {msg_ref['id']}: {error}")
+                continue
+            if not full_msg.get('threadId'):
+                full_msg['threadId'] = msg_ref.get('threadId', '')
+            messages.append(self._build_message_from_response(full_msg))
+        return messages
+
+    def _get_full_messages(
+        self,
+        user_id: str,
+        msg_ids: List[str]
+    ) -> List[Tuple[Optional[dict], Optional[HttpError]]]:
+        """
+        Fetches full message resources using batched HTTP requests, so a
+        page of messages costs one round trip per batch rather than one per
+        message.
+
+        Args:
+            user_id: The user's email address.
+            msg_ids: The IDs of the messages to fetch.
+
+        Returns:
+            A list of (message, error) pairs in the order of msg_ids; exactly
+            one of each pair is None.
+
+        """
+
+        results = [None] * len(msg_ids)
+
+        def on_response(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        for start in range(0, len(msg_ids), self._MAX_BATCH_REQUESTS):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for i in range(start, min(start + self._MAX_BATCH_REQUESTS, len(msg_ids))):
+                batch.add(
+                    self.service.users().messages().get(
+                        userId=user_id,
+                        id=msg_ids[i],
+                        format='full'
+                    ),
+                    request_id=str(i)
+                )
+            batch.execute()
+
+        return results
+
     def _build_message_from_response(self, response: dict) -> Message:
         """Build a Message object from a Gmail API response."""
         # Extract headers
@@ -1044,8 +1122,22 @@ class Gmail(object):
         elif payload['mimeType'] == 'text/html':
             data = payload['body']['data']
             data = base64.urlsafe_b64decode(data)
-            body = BeautifulSoup(data, 'lxml', from_encoding='utf-8').body
-            return [{ 'part_type': 'html', 'body': str(body) }]
+            if b'<' not in data:
+                # No markup to parse; normalize the text the way lxml would:
+                # line endings and NULs first, then entities, then leading
+                # whitespace (which does not include &nbsp;)
+                text = data.decode('utf-8', errors='replace')
+                text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\x00', '\ufffd')
+                text = html.unescape(text).lstrip(_HTML_WHITESPACE)
+                body = f'<body>{html.escape(text, quote=False)}</body>' if text else ''
+                return [{ 'part_type': 'html', 'body': body }]
+            try:
+                body = lxml.html.document_fromstring(data, parser=_HTML_PARSER).body
+            except etree.ParserError:  # empty document
+                body = None
+            # Head-only documents have no body element
+            body = lxml.html.tostring(body, encoding='unicode') if body is not None else ''
+            return [{ 'part_type': 'html', 'body': body }]
 
         elif payload['mimeType'] == 'text/plain':
             data = payload['body']['data']
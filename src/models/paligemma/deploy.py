@@ -4,10 +4,9 @@
 
 import datetime
 import os
-import subprocess
-from typing import Tuple
+from typing import Optional, Tuple
 
-from google.cloud import aiplatform
+from google.cloud import aiplatform, resourcemanager_v3
 
 # Initialize variables
 PROJECT_ID = os.environ["GOOGLE_CLOUD_PROJECT"]
@@ -20,6 +19,21 @@ MODEL_PATH_PREFIX = os.environ.get(
 # Initialize empty dictionaries for models and endpoints
 models, endpoints = {}, {}
 
+# Project number never changes within a process, so it is looked up once
+_project_number: Optional[str] = None
+
+
+def get_project_number() -> str:
+    """Return the numeric project ID for PROJECT_ID via the Resource Manager API."""
+    global _project_number
+    if _project_number is None:
+        project = resourcemanager_v3.ProjectsClient().get_project(
+            name=f"projects/{PROJECT_ID}"
+        )
+        # project.name has the form "projects/{NUMBER}"
+        _project_number = project.name.split("/")[-1]
+    return _project_number
+
 
 def deploy_model(
     model_name: str,
@@ -56,16 +70,7 @@ def deploy_model(
     )
 
     # Get the default SERVICE_ACCOUNT
-    result = subprocess.run(
-        ["gcloud", "projects", "describe", PROJECT_ID], capture_output=True, text=True
-    )
-    project_number = (
-        [line for line in result.stdout.split("\n") if "projectNumber" in line][0]
-        .split(":")[1]
-        .strip()
-        .replace("'", "")
-    )
-    SERVICE_ACCOUNT = f"{project_number}-compute@developer.gserviceaccount.com"
+    SERVICE_ACCOUNT = f"{get_project_number()}-compute@developer.gserviceaccount.com"
 
     model.deploy(
         endpoint=endpoint,
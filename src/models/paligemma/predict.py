@@ -18,6 +18,7 @@ from PIL import Image
 from google.api_core import retry, exceptions
 import grpc  # type: ignore
 import logging
+import threading
 import time
 import os
 from dotenv import load_dotenv
@@ -40,6 +41,9 @@ logger.info(f"Using endpoint: {ENDPOINT_PATH}")
 
 endpoint = aiplatform.Endpoint(ENDPOINT_PATH)
 
+# Delay before the warmup request so module import is never blocked on it
+WARMUP_DELAY_SECONDS = 0.5
+
 
 def _resize_image(img: Image.Image, max_size: int = 1024) -> bytes:  # type: ignore
     """Resize image if it exceeds max dimensions while maintaining aspect ratio."""
@@ -98,6 +102,35 @@ def make_prediction(
             raise last_error  # Directly raise the last error instead of creating a new one
 
 
+def _warmup(delay: float = WARMUP_DELAY_SECONDS) -> None:
+    """Send a tiny prediction so DNS, TLS and the OAuth token are ready.
+
+    The first call to ``endpoint.predict`` pays for connection setup and the
+    token fetch; doing it here keeps that cost off the first real request.
+    Failures are logged and otherwise ignored.
+    """
+    time.sleep(delay)
+    try:
+        pixel = base64.b64encode(_resize_image(Image.new("RGB", (1, 1)))).decode("utf-8")
+        endpoint.predict(
+            instances=[{"image": pixel, "prompt": "ping", "task": "vqa", "max_tokens": 1}]
+        )
+        logger.info("Endpoint warmup complete")
+    except Exception as e:
+        logger.warning(f"Endpoint warmup failed: {e}")
+
+
+def start_warmup() -> threading.Thread:
+    """Run the endpoint warmup on a background daemon thread."""
+    thread = threading.Thread(target=_warmup, name="paligemma-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if os.getenv("TESTING", "").lower() != "true":
+    start_warmup()
+
+
 if __name__ == "__main__":
     # Example usage
     project = "gmail-ai-autolabel"  # Project ID
@@ -10,19 +10,48 @@ Responsibilities:
 - Regulatory compliance
 """
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import orjson
+
+# Naive datetimes in audit records are always UTC
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+# Audit timestamps have second resolution; the formatted value is reused
+# until the clock moves on to the next second. The second and its string are
+# kept in one tuple so a reader never sees one updated without the other.
+_ts_cache = (0, "")
+
+def _now_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string, cached per second."""
+    global _ts_cache
+    sec = int(time.time())
+    cached_sec, cached_str = _ts_cache
+    if sec != cached_sec:
+        # Records keep the naive UTC format they have always used
+        cached_str = datetime.fromtimestamp(sec, timezone.utc).replace(tzinfo=None).isoformat()
+        _ts_cache = (sec, cached_str)
+    return cached_str
+
 class AuditService:
-    def __init__(self, storage_service):
+    def __init__(self, storage_service, serialize_records: bool = False):
+        """
+        Args:
+            storage_service: Backend that persists audit records
+            serialize_records: Encode records to JSON bytes with orjson and hand
+                them to ``storage.store_audit_log_bytes`` instead of passing dicts
+        """
         self.storage = storage_service
+        self.serialize_records = serialize_records
 
     async def log_success(self, message_id: str, processing_state: Any) -> None:
         """Log a successful email processing operation."""
-        await self.storage.store_audit_log({
+        await self._store({
             "message_id": message_id,
             "event_type": "success",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "processing_duration_ms": self._calculate_duration(
                 processing_state.started_at,
                 processing_state.completed_at
@@ -32,21 +61,21 @@ class AuditService:
 
     async def log_error(self, message_id: str, error: Exception) -> None:
         """Log an error that occurred during email processing."""
-        await self.storage.store_audit_log({
+        await self._store({
             "message_id": message_id,
             "event_type": "error",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "error_message": str(error),
             "error_type": error.__class__.__name__
         })
 
     async def log_security_event(self, message_id: str, event_type: str, details: Dict[str, Any]) -> None:
         """Log a security-related event."""
-        await self.storage.store_audit_log({
+        await self._store({
             "message_id": message_id,
             "event_type": "security",
             "security_event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "details": details
         })
 
@@ -78,6 +107,18 @@ class AuditService:
             end_date=end_date
         )
 
+    @staticmethod
+    def encode_record(record: Dict[str, Any]) -> bytes:
+        """Serialize an audit record to JSON bytes."""
+        return orjson.dumps(record, option=ORJSON_OPTIONS)
+
+    async def _store(self, record: Dict[str, Any]) -> None:
+        """Send a record to storage, pre-encoded when serialization is enabled."""
+        if self.serialize_records:
+            await self.storage.store_audit_log_bytes(self.encode_record(record))
+        else:
+            await self.storage.store_audit_log(record)
+
     def _calculate_duration(
         self,
         start_time: datetime,
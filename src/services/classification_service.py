@@ -21,12 +21,11 @@ Responsibilities:
 - Machine learning model integration
 - Classification accuracy tracking
 """
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import asyncio
 from email.message import Message
-from ..classifiers import ClassifierFactory, ClassificationResult
-from ..client.attachment import extract_text_from_attachment
+from ..classifiers import ClassifierFactory, ClassificationBatch, ClassificationResult
 
 class ClassificationService:
     """Service for classifying documents and emails."""
@@ -57,8 +56,6 @@ class ClassificationService:
         Returns:
             List of classification results (one for email body, plus one per attachment)
         """
-        results = []
-        
         # Extract email metadata
         metadata = {
             "email_subject": email_message["subject"],
@@ -67,36 +64,63 @@ class ClassificationService:
             "message_id": email_message["message-id"]
         }
         
-        # Classify email body
-        if email_message.is_multipart():
-            body = ""
-            for part in email_message.walk():
-                if part.get_content_type() == "text/plain":
-                    body += part.get_payload(decode=True).decode()
-        else:
-            body = email_message.get_payload(decode=True).decode()
-            
-        if body.strip():
-            body_result = await self.classifier.classify_document(
+        # Decode the message parts off the event loop
+        body, attachments = await asyncio.to_thread(
+            self._split_message, email_message, extract_attachments
+        )
+        
+        # Classify the body and all attachments concurrently
+        tasks = []
+        if body:
+            tasks.append(self.classifier.classify_document(
                 body, source_type="text", metadata=metadata
+            ))
+        tasks.extend(
+            self.classifier.classify_document(
+                content, 
+                source_type="bytes",
+                metadata={**metadata, "filename": filename}
             )
-            results.append(body_result)
-            
-        # Process attachments if requested
-        if extract_attachments:
-            for part in email_message.walk():
-                if part.get_content_maintype() == "application":
-                    filename = part.get_filename()
-                    if filename:
-                        content = part.get_payload(decode=True)
-                        attachment_result = await self.classifier.classify_document(
-                            content, 
-                            source_type="bytes",
-                            metadata={**metadata, "filename": filename}
-                        )
-                        results.append(attachment_result)
+            for filename, content in attachments
+        )
                         
-        return results
+        return list(await asyncio.gather(*tasks))
+        
+    @staticmethod
+    def _split_message(email_message: Message,
+                       extract_attachments: bool) -> Tuple[str, List[Tuple[str, bytes]]]:
+        """
+        Walk an email message once, decoding its body text and attachments.
+        
+        Args:
+            email_message: Email message to split
+            extract_attachments: Whether to collect attachments
+            
+        Returns:
+            Tuple of (body text, list of (filename, content) attachments);
+            the body is empty when no text part has content
+        """
+        is_multipart = email_message.is_multipart()
+        text_parts = []
+        body_nonempty = False
+        attachments = []
+        for part in email_message.walk():
+            # Skip parts that declare an empty payload without decoding them
+            if part.get("Content-Length") == "0":
+                continue
+            if not is_multipart or part.get_content_type() == "text/plain":
+                chunk = part.get_payload(decode=True) or b""
+                if chunk.strip():
+                    body_nonempty = True
+                text_parts.append(chunk)
+            if extract_attachments and part.get_content_maintype() == "application":
+                filename = part.get_filename()
+                if filename:
+                    attachments.append((filename, part.get_payload(decode=True)))
+        if not body_nonempty:
+            return "", attachments
+        body = b"".join(text_parts).decode("utf-8", errors="replace")
+        return body, attachments
         
     async def classify_document(self,
                               source: Union[str, Path, bytes],
@@ -136,6 +160,26 @@ class ClassificationService:
             sources, source_type, metadata, max_concurrent
         )
         
+    async def classify_batch_columnar(self,
+                                    sources: List[Union[str, Path, bytes]],
+                                    source_type: str = "file",
+                                    metadata: Optional[List[Dict]] = None,
+                                    max_concurrent: int = 5) -> ClassificationBatch:
+        """
+        Classify multiple documents and return the results as columns.
+        
+        Args:
+            sources: List of document sources
+            source_type: Type of the sources
+            metadata: Optional list of metadata dicts
+            max_concurrent: Maximum concurrent classifications
+            
+        Returns:
+            ClassificationBatch with per-document arrays in source order
+        """
+        results = await self.classify_batch(sources, source_type, metadata, max_concurrent)
+        return ClassificationBatch.from_results(results)
+        
     async def watch_directory(self,
                             directory: Union[str, Path],
                             pattern: str = "*.*",
@@ -152,30 +196,40 @@ class ClassificationService:
         from watchdog.events import FileSystemEventHandler
         
         class DocumentHandler(FileSystemEventHandler):
-            def __init__(self, service):
-                self.service = service
+            def __init__(self, loop, queue):
+                self.loop = loop
+                self.queue = queue
                 
-            async def process_file(self, path):
-                try:
-                    result = await self.service.classify_document(path)
-                    # Handle the classification result (e.g., rename file, move to processed folder)
-                    print(f"Classified {path}: {result.document_type}")
-                except Exception as e:
-                    print(f"Error processing {path}: {e}")
-                    
             def on_created(self, event):
+                # Watchdog calls this from its own thread, so hand the path
+                # over to the event loop rather than touching it directly
                 if not event.is_directory:
-                    asyncio.create_task(self.process_file(event.src_path))
+                    self.loop.call_soon_threadsafe(self.queue.put_nowait, event.src_path)
                     
+        async def process_file(path):
+            try:
+                result = await self.classify_document(path)
+                # Handle the classification result (e.g., rename file, move to processed folder)
+                print(f"Classified {path}: {result.document_type}")
+            except Exception as e:
+                print(f"Error processing {path}: {e}")
+                
         path = Path(directory)
-        event_handler = DocumentHandler(self)
+        queue: asyncio.Queue = asyncio.Queue()
+        event_handler = DocumentHandler(asyncio.get_running_loop(), queue)
         observer = Observer()
         observer.schedule(event_handler, str(path), recursive=recursive)
         observer.start()
         
+        pending = set()
         try:
             while True:
-                await asyncio.sleep(1)
+                file_path = await queue.get()
+                task = asyncio.create_task(process_file(file_path))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
         except KeyboardInterrupt:
+            pass
+        finally:
             observer.stop()
-        observer.join()
+            observer.join()
@@ -2,47 +2,330 @@
 Content Extraction Service using Google's Gemini Flash
 """
 import os
-from typing import Dict, List, Optional, Union
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 import google.generativeai as genai
 from pathlib import Path
-import json
-import base64
+import asyncio
+import functools
+import hashlib
+import orjson
 import mimetypes
+import sqlite3
+import threading
+import time
+
+EXTRACTION_PROMPT = """
+Please analyze this document and extract the following information in JSON format:
+{
+    "document_type": "The type of regulatory document (e.g., registration, renewal, tonnage report)",
+    "entities": {
+        "companies": ["List of company names mentioned"],
+        "products": ["List of product names/types mentioned"],
+        "states": ["List of US states mentioned"]
+    },
+    "key_fields": {
+        "dates": ["Any important dates mentioned"],
+        "registration_numbers": ["Any registration or license numbers"],
+        "amounts": ["Any monetary amounts or quantities"]
+    },
+    "tables": ["Array of any tables found, each as a list of rows"],
+    "summary": "A brief summary of the document's purpose and content"
+}
+
+Please be precise and only include information that is explicitly present in the document.
+If any field has no relevant information, return an empty array or null.
+"""
+
+# Default SQLite file for the extraction cache, relative to the working directory
+DEFAULT_CACHE_PATH = Path("cache.db")
+
+# Prompt hash state reused as the starting point of every cache key
+_PROMPT_DIGEST = hashlib.sha256(EXTRACTION_PROMPT.encode('utf-8'))
+
+@functools.lru_cache(maxsize=64)
+def _mime_for(suffix: str) -> str:
+    """Return the MIME type for a file suffix, cached since suffixes repeat."""
+    return mimetypes.guess_type('x' + suffix)[0] or 'application/octet-stream'
+
+# genai.configure sets a single API key for the whole process, so one model
+# is shared by every service and rebuilt when a different key is configured
+_MODEL: Optional[Tuple[str, genai.GenerativeModel]] = None
+_MODEL_LOCK = threading.Lock()
+
+def _get_model(api_key: str) -> genai.GenerativeModel:
+    """
+    Return the process-wide Gemini model, configuring the API key if it changed.
+    
+    Args:
+        api_key: The Gemini API key
+        
+    Returns:
+        The GenerativeModel used for extraction
+    """
+    global _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None or _MODEL[0] != api_key:
+            genai.configure(api_key=api_key)
+            _MODEL = (api_key, genai.GenerativeModel('gemini-pro-vision'))
+        return _MODEL[1]
+
+BATCH_EXTRACTION_INSTRUCTIONS = """
+You will receive {count} documents. Analyze each one independently and return
+{{"results": [...]}} containing one object in the format above per document,
+in the same order the documents were provided.
+"""
+
+class ExtractionBatcher:
+    """
+    Coalesces concurrent extraction requests into multi-document Gemini calls.
+    
+    Requests arriving within max_latency_ms of the first queued request are
+    sent together, up to max_batch_size documents per call, and each caller
+    receives the result for its own document. Batches are dispatched as
+    separate tasks, so several Gemini calls can be in flight at once.
+    """
+    
+    def __init__(self, model, max_batch_size: int = 8, max_latency_ms: float = 50.0):
+        """
+        Initialize the batcher.
+        
+        Args:
+            model: Gemini model used for generation
+            max_batch_size: Maximum number of documents per Gemini call
+            max_latency_ms: Maximum time to wait for a batch to fill up
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+        self._pending: Set[asyncio.Future] = set()
+        
+    async def submit(self, file_blob: Dict) -> Dict:
+        """
+        Queue a document for extraction and wait for its result.
+        
+        Args:
+            file_blob: Dict with mime_type and data fields
+            
+        Returns:
+            The raw extraction result for this document
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        try:
+            await self._queue.put((file_blob, future))
+            return await future
+        finally:
+            self._pending.discard(future)
+            
+    async def aclose(self) -> None:
+        """Stop the worker and in-flight batches, failing unanswered requests."""
+        tasks = list(self._dispatches)
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        
+        for future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Extraction batcher closed"))
+        
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+            
+    async def _dispatch(self, batch: List[Tuple[Dict, asyncio.Future]]) -> None:
+        """Run one Gemini call for a batch and resolve each caller's future."""
+        try:
+            results = await asyncio.to_thread(self._generate, [blob for blob, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+            
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+                
+    def _generate(self, blobs: List[Dict]) -> List[Dict]:
+        """
+        Send documents to Gemini in a single request.
+        
+        Args:
+            blobs: Dicts with mime_type and data fields
+            
+        Returns:
+            One raw extraction result per blob, in order
+        """
+        if len(blobs) == 1:
+            prompt = EXTRACTION_PROMPT
+        else:
+            prompt = EXTRACTION_PROMPT + BATCH_EXTRACTION_INSTRUCTIONS.format(count=len(blobs))
+        parts = [{'text': prompt}] + [{'inline_data': blob} for blob in blobs]
+        response = self.model.generate_content([{'parts': parts}])
+        
+        try:
+            parsed = orjson.loads(response.text)
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse Gemini response as JSON")
+            
+        if len(blobs) == 1:
+            return [parsed]
+        results = parsed.get('results') if isinstance(parsed, dict) else None
+        if not isinstance(results, list) or len(results) != len(blobs):
+            raise ValueError(f"Expected {len(blobs)} results in batched Gemini response")
+        return results
 
 class ContentExtractionService:
-    def __init__(self, api_key: str):
+    def __init__(self,
+                 api_key: str,
+                 cache_path: Optional[Union[str, Path]] = None,
+                 cache_size: int = 1024,
+                 max_batch_size: int = 1,
+                 max_latency_ms: float = 50.0):
         """
         Initialize the content extraction service.
         
         Args:
             api_key: The Gemini API key
+            cache_path: Optional SQLite file for the extraction cache, so results
+                survive across runs. Defaults to DEFAULT_CACHE_PATH; pass
+                ":memory:" for a cache that lives as long as the service.
+            cache_size: Maximum number of cached results; least recently used
+                entries are evicted first. 0 disables the cache.
+            max_batch_size: Maximum documents coalesced into one Gemini call.
+                1 sends every document in its own request.
+            max_latency_ms: How long to wait for a batch to fill up
         """
         if not api_key:
             raise ValueError("API key is required")
             
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-pro-vision')
+        self.model = _get_model(api_key)
+        
+        self.cache_size = cache_size
+        self._cache_lock = asyncio.Lock()
+        # Access times from cache hits, written back with the next store
+        self._cache_touched: Dict[bytes, int] = {}
+        self._cache = sqlite3.connect(
+            str(cache_path or DEFAULT_CACHE_PATH),
+            check_same_thread=False
+        )
+        self._cache.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "hash BLOB PRIMARY KEY, json BLOB, created_at INTEGER, accessed_at INTEGER)"
+        )
+        self._cache.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+        self._cache.commit()
+        
+        self.batcher = None
+        if max_batch_size > 1:
+            self.batcher = ExtractionBatcher(self.model, max_batch_size, max_latency_ms)
         
-    def _read_file_as_base64(self, file_path: Path) -> Dict:
+    def _cache_key(self, file_path: Path) -> bytes:
         """
-        Read a file and convert it to a base64-encoded blob with MIME type.
+        Hash the prompt and file contents, so prompt edits invalidate entries.
         
         Args:
             file_path: Path to the file
             
         Returns:
-            Dict with mime_type and data fields
+            SHA-256 digest identifying the extraction request
         """
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type:
-            mime_type = 'application/octet-stream'
-            
+        digest = _PROMPT_DIGEST.copy()
         with open(file_path, 'rb') as f:
-            data = base64.b64encode(f.read()).decode('utf-8')
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return digest.digest()
+        
+    def _cache_get(self, key: bytes) -> Optional[bytes]:
+        """Return the cached JSON for a key and mark it as recently used."""
+        row = self._cache.execute(
+            "SELECT json FROM cache WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._cache_touched[key] = time.time_ns()
+        return row[0]
+        
+    def _flush_cache_touches(self) -> None:
+        """Write access times recorded by cache hits back to the table."""
+        if self._cache_touched:
+            self._cache.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE hash = ?",
+                [(accessed_at, key) for key, accessed_at in self._cache_touched.items()]
+            )
+            self._cache_touched.clear()
+        
+    def _cache_put(self, key: bytes, value: bytes) -> None:
+        """Store a result and evict least recently used entries past cache_size."""
+        self._flush_cache_touches()
+        self._cache.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (key, value, int(time.time()), time.time_ns())
+        )
+        overflow = self._cache.execute(
+            "SELECT COUNT(*) FROM cache"
+        ).fetchone()[0] - self.cache_size
+        if overflow > 0:
+            self._cache.execute(
+                "DELETE FROM cache WHERE hash IN "
+                "(SELECT hash FROM cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+        self._cache.commit()
+        
+    def close(self) -> None:
+        """Persist pending cache access times and close the cache database."""
+        self._flush_cache_touches()
+        self._cache.commit()
+        self._cache.close()
+        
+    async def aclose(self) -> None:
+        """Stop the extraction batcher, if any, then close the cache."""
+        if self.batcher is not None:
+            await self.batcher.aclose()
+        self.close()
+        
+    def _read_file_blob(self, file_path: Path) -> Dict:
+        """
+        Read a file into an inline data blob with MIME type.
+        
+        The Gemini SDK base64-encodes inline data itself, so the raw bytes
+        are passed through unchanged.
+        
+        Args:
+            file_path: Path to the file
             
+        Returns:
+            Dict with mime_type and data fields
+        """
         return {
-            'mime_type': mime_type,
-            'data': data
+            'mime_type': _mime_for(file_path.suffix),
+            'data': file_path.read_bytes()
         }
         
     def _validate_extraction(self, result: Dict) -> Dict:
@@ -97,76 +380,112 @@ class ContentExtractionService:
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
                 
-            # Convert file to base64 blob
-            file_blob = self._read_file_as_base64(file_path)
+            # Return the cached result for identical documents
+            cache_key = None
+            if self.cache_size > 0:
+                cache_key = await asyncio.to_thread(self._cache_key, file_path)
+                async with self._cache_lock:
+                    cached = await asyncio.to_thread(self._cache_get, cache_key)
+                if cached is not None:
+                    return orjson.loads(cached)
                 
-            # Prepare the prompt for Gemini
-            prompt = """
-            Please analyze this document and extract the following information in JSON format:
-            {
-                "document_type": "The type of regulatory document (e.g., registration, renewal, tonnage report)",
-                "entities": {
-                    "companies": ["List of company names mentioned"],
-                    "products": ["List of product names/types mentioned"],
-                    "states": ["List of US states mentioned"]
-                },
-                "key_fields": {
-                    "dates": ["Any important dates mentioned"],
-                    "registration_numbers": ["Any registration or license numbers"],
-                    "amounts": ["Any monetary amounts or quantities"]
-                },
-                "tables": ["Array of any tables found, each as a list of rows"],
-                "summary": "A brief summary of the document's purpose and content"
-            }
-            
-            Please be precise and only include information that is explicitly present in the document.
-            If any field has no relevant information, return an empty array or null.
-            """
-            
-            # Process with Gemini
-            response = self.model.generate_content([{
-                'parts': [
-                    {'text': prompt},
-                    {'inline_data': file_blob}
-                ]
-            }])
-            
-            # Parse and validate the response
-            try:
-                result = json.loads(response.text)
-                return self._validate_extraction(result)
-            except json.JSONDecodeError:
-                raise ValueError("Failed to parse Gemini response as JSON")
+            # Load file as an inline data blob
+            file_blob = await asyncio.to_thread(self._read_file_blob, file_path)
+            
+            # Process with Gemini, coalescing with concurrent requests if enabled
+            if self.batcher is not None:
+                result = self._validate_extraction(await self.batcher.submit(file_blob))
+            else:
+                response = await asyncio.to_thread(self.model.generate_content, [{
+                    'parts': [
+                        {'text': EXTRACTION_PROMPT},
+                        {'inline_data': file_blob}
+                    ]
+                }])
+                
+                # Parse and validate the response
+                try:
+                    result = self._validate_extraction(orjson.loads(response.text))
+                except orjson.JSONDecodeError:
+                    raise ValueError("Failed to parse Gemini response as JSON")
+                
+            if cache_key is not None:
+                async with self._cache_lock:
+                    await asyncio.to_thread(self._cache_put, cache_key, orjson.dumps(result))
+            return result
                 
         except Exception as e:
             raise Exception(f"Content extraction failed: {str(e)}")
             
-    async def batch_extract(self, file_paths: List[Union[str, Path]]) -> List[Dict]:
+    async def _extract_with_status(self,
+                                   file_path: Union[str, Path],
+                                   semaphore: asyncio.Semaphore) -> Dict:
         """
-        Extract content from multiple documents in batch.
+        Extract content from one document, capturing failures in the result.
         
         Args:
-            file_paths: List of paths to document files
+            file_path: Path to the document file
+            semaphore: Semaphore bounding concurrent extractions
             
         Returns:
-            List of dictionaries containing:
-            - success: Whether extraction succeeded
-            - data: Extracted content if successful
-            - error: Error message if failed
+            Dict with success, data and error fields
         """
-        results = []
-        for file_path in file_paths:
+        async with semaphore:
             try:
                 data = await self.extract_content(file_path)
-                results.append({
+                return {
                     'success': True,
                     'data': data,
                     'error': None
-                })
+                }
             except Exception as e:
-                results.append({
+                return {
                     'success': False,
                     'data': None,
                     'error': str(e)
-                })
-        return results
+                }
+                
+    async def batch_extract(self,
+                            file_paths: List[Union[str, Path]],
+                            max_concurrent: int = 5) -> List[Dict]:
+        """
+        Extract content from multiple documents in batch.
+        
+        Args:
+            file_paths: List of paths to document files
+            max_concurrent: Maximum number of concurrent extractions
+            
+        Returns:
+            List of dictionaries, in the same order as file_paths, containing:
+            - success: Whether extraction succeeded
+            - data: Extracted content if successful
+            - error: Error message if failed
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        return await asyncio.gather(*[
+            self._extract_with_status(file_path, semaphore)
+            for file_path in file_paths
+        ])
+        
+    async def extract_as_completed(self,
+                                   file_paths: List[Union[str, Path]],
+                                   max_concurrent: int = 5
+                                   ) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Extract content from multiple documents, yielding results as they finish.
+        
+        Args:
+            file_paths: List of paths to document files
+            max_concurrent: Maximum number of concurrent extractions
+            
+        Yields:
+            Tuples of (index into file_paths, result dict as in batch_extract)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def indexed(index: int, file_path: Union[str, Path]) -> Tuple[int, Dict]:
+            return index, await self._extract_with_status(file_path, semaphore)
+            
+        tasks = [indexed(i, file_path) for i, file_path in enumerate(file_paths)]
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
@@ -1,6 +1,9 @@
+import asyncio
+import time
+from collections import OrderedDict
 from typing import List, Optional, Dict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
 from src.client.gmail import Gmail
@@ -13,16 +16,34 @@ class ProcessingStatus(Enum):
     FAILED = "FAILED"
     RETRYING = "RETRYING"
 
+_EPOCH = datetime(1970, 1, 1)
+
+def _ns_to_datetime(ns: int) -> datetime:
+    """Convert a time.time_ns() value to a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
 @dataclass
 class EmailProcessingState:
     email_id: str
     status: ProcessingStatus
-    started_at: datetime
-    completed_at: Optional[datetime] = None
+    # Timestamps are kept as time.time_ns() values and only turned into
+    # datetimes when read, e.g. by the audit log
+    started_at_ns: int
+    completed_at_ns: Optional[int] = None
     error: Optional[str] = None
     retry_count: int = 0
     metadata: Dict = None
 
+    @property
+    def started_at(self) -> datetime:
+        return _ns_to_datetime(self.started_at_ns)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        if self.completed_at_ns is None:
+            return None
+        return _ns_to_datetime(self.completed_at_ns)
+
 class EmailProcessingService:
     """
     EmailProcessingService: Orchestrates the complete email processing pipeline.
@@ -45,7 +66,10 @@ class EmailProcessingService:
         classification_service,
         storage_service,
         notification_service,
-        audit_service
+        audit_service,
+        max_concurrent: int = 16,
+        max_tracked_states: int = 10_000,
+        max_cached_extractions: int = 512
     ):
         self.gmail = gmail_client
         self.security = security_service
@@ -54,20 +78,59 @@ class EmailProcessingService:
         self.storage = storage_service
         self.notifier = notification_service
         self.audit = audit_service
-        self.processing_queue: Dict[str, EmailProcessingState] = {}
+        # Most recently touched states last; the oldest are evicted beyond
+        # max_tracked_states so a long-running service does not grow forever
+        self.processing_queue: "OrderedDict[str, EmailProcessingState]" = OrderedDict()
+        self.max_tracked_states = max_tracked_states
+        # Number of emails processed concurrently
+        self.max_concurrent = max_concurrent
+        # Extracted content of emails that have not completed yet, so a
+        # retry does not extract the same message again
+        self._extraction_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_cached_extractions = max_cached_extractions
 
     async def process_new_emails(self) -> List[EmailProcessingState]:
         """Main entry point for processing new emails"""
         try:
-            # Get unread messages from inbox
-            messages = self.gmail.get_unread_inbox()
+            # Stream unread messages page by page into a bounded queue so
+            # processing starts while later pages are still being fetched
+            queue: asyncio.Queue = asyncio.Queue(maxsize=64)
             results = []
             
-            for message in messages:
-                state = await self.process_email(message)
-                results.append(state)
+            async def produce() -> None:
+                pages = self.gmail.iter_unread_inbox()
+                index = 0
+                while (page := await asyncio.to_thread(next, pages, None)) is not None:
+                    for message in page:
+                        await queue.put((index, message))
+                        index += 1
+            
+            async def work() -> None:
+                while (item := await queue.get()) is not None:
+                    index, message = item
+                    try:
+                        state = await self.process_email(message)
+                    except Exception as e:
+                        # One failing email must not abort the rest of the batch
+                        state = self._failed_state(message, e)
+                    results.append((index, state))
             
-            return results
+            # max_concurrent workers bound in-flight emails to stay within
+            # Gmail and model rate limits
+            workers = [asyncio.create_task(work()) for _ in range(self.max_concurrent)]
+            try:
+                await produce()
+                # One sentinel per worker once every message is queued
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                # A failed fetch must not leave workers processing in the background
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            results.sort(key=lambda item: item[0])
+            return [state for _, state in results]
             
         except Exception as e:
             await self.notifier.send_error("Batch processing failed", str(e))
@@ -81,10 +144,10 @@ class EmailProcessingService:
         state = EmailProcessingState(
             email_id=message.id,
             status=ProcessingStatus.PROCESSING,
-            started_at=datetime.utcnow(),
+            started_at_ns=time.time_ns(),
             metadata={"sender": message.sender, "subject": message.subject}
         )
-        self.processing_queue[message.id] = state
+        self._track_state(state)
 
         try:
             # Security check
@@ -92,7 +155,10 @@ class EmailProcessingService:
             if not security_result.is_safe:
                 state.status = ProcessingStatus.FAILED
                 state.error = f"Email failed security verification: {', '.join(security_result.checks_failed)}"
-                state.completed_at = datetime.utcnow()
+                state.completed_at_ns = time.time_ns()
+                if security_result.short_circuit:
+                    # Obvious rejections are already audited by the security service
+                    return state
                 await self.notifier.send_error(
                     f"Email {message.id} failed security verification",
                     f"Failed checks: {', '.join(security_result.checks_failed)}"
@@ -104,7 +170,7 @@ class EmailProcessingService:
                 return state
 
             # Extract content
-            content = await self.extractor.extract_content(message)
+            content = await self._extract_content(message)
             
             # Classify content
             classification = await self.classifier.classify(content)
@@ -114,7 +180,8 @@ class EmailProcessingService:
             
             # Update state
             state.status = ProcessingStatus.COMPLETED
-            state.completed_at = datetime.utcnow()
+            state.completed_at_ns = time.time_ns()
+            self._extraction_cache.pop(message.id, None)
             
             # Audit success
             await self.audit.log_success(message.id, state)
@@ -123,7 +190,7 @@ class EmailProcessingService:
 
         except Exception as e:
             state.error = str(e)
-            state.completed_at = datetime.utcnow()
+            state.completed_at_ns = time.time_ns()
             
             await self.notifier.send_error(f"Failed to process email {message.id}", str(e))
             await self.audit.log_error(message.id, e)
@@ -142,6 +209,42 @@ class EmailProcessingService:
             
             return state
 
+    async def _extract_content(self, message: Message):
+        """Extract content, reusing the result from an earlier attempt"""
+        content = self._extraction_cache.get(message.id)
+        if content is None:
+            content = await self.extractor.extract_content(message)
+            self._extraction_cache[message.id] = content
+            while len(self._extraction_cache) > self.max_cached_extractions:
+                self._extraction_cache.popitem(last=False)
+        else:
+            self._extraction_cache.move_to_end(message.id)
+        return content
+
+    def _track_state(self, state: EmailProcessingState) -> None:
+        """Record a processing state, evicting the oldest beyond the cap"""
+        self.processing_queue[state.email_id] = state
+        self.processing_queue.move_to_end(state.email_id)
+        while len(self.processing_queue) > self.max_tracked_states:
+            self.processing_queue.popitem(last=False)
+
+    def _failed_state(self, message: Message, error: Exception) -> EmailProcessingState:
+        """Mark an email whose processing raised as FAILED"""
+        now = time.time_ns()
+        state = self.processing_queue.get(message.id)
+        if state is None:
+            state = EmailProcessingState(
+                email_id=message.id,
+                status=ProcessingStatus.FAILED,
+                started_at_ns=now,
+                metadata={"sender": message.sender, "subject": message.subject}
+            )
+            self._track_state(state)
+        state.status = ProcessingStatus.FAILED
+        state.error = str(error)
+        state.completed_at_ns = now
+        return state
+
     async def _schedule_retry(self, message: Message):
         """Schedule a retry for failed message processing"""
         state = self.processing_queue[message.id]
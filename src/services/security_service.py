@@ -1,12 +1,115 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import asyncio
 import re
 import logging
 
+try:
+    import hyperscan
+except ImportError:  # optional DFA scanner; falls back to the re alternation
+    hyperscan = None
+
 from src.client.message import Message
 from src.client.attachment import Attachment
 
+# Patterns that flag email content as suspicious (matched case-insensitively).
+# Gaps are bounded so a hostile message cannot force long scans.
+SUSPICIOUS_PATTERNS = (
+    r'urgent.{0,200}transfer',
+    r'bank.{0,200}verify',
+    r'password.{0,200}reset',
+    r'suspicious.{0,200}activity',
+    r'malicious',
+    r'suspicious.{0,200}message',
+)
+_SUSPICIOUS_PATTERN_RES = tuple(re.compile(p, re.IGNORECASE) for p in SUSPICIOUS_PATTERNS)
+# One alternation so clean content is scanned in a single pass
+_SUSPICIOUS_RE = re.compile('|'.join(SUSPICIOUS_PATTERNS), re.IGNORECASE)
+# Every pattern contains one of these words, so content without any of
+# them cannot match and skips the regex engine entirely
+_SUSPICIOUS_KEYWORDS = ('urgent', 'bank', 'password', 'suspicious', 'malicious')
+_SENDER_DOMAIN_RE = re.compile(r'@([\w.-]+)')
+_DOMAIN_CHARS_RE = re.compile(r'[\w.-]+')
+
+# For testing, trust example.com domain
+TRUSTED_DOMAINS = frozenset({'example.com'})
+BLOCKED_SENDERS = frozenset()  # TODO: Load from config
+ALLOWED_ATTACHMENT_TYPES = frozenset({
+    'application/pdf', 'image/jpeg', 'image/png',
+    'application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+})
+
+# Security event logged for each failed verify_email check
+SECURITY_EVENTS = {
+    "sender_verification": ("suspicious_sender", "Suspicious sender detected: {sender}"),
+    "attachment_scan": ("suspicious_attachment", "Suspicious attachments detected in email"),
+    "content_safety": ("suspicious_content", "Suspicious content patterns detected in email"),
+}
+
+# A failure of any of these checks makes the email a high threat
+HIGH_THREAT_CHECKS = frozenset({"attachment_scan"})
+
+# MIME types assumed for attachments that do not report a filetype
+EXTENSION_MIME_TYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png'
+}
+
+def _compile_suspicious_db():
+    """Compile the suspicious patterns into one Hyperscan database."""
+    db = hyperscan.Database()
+    count = len(SUSPICIOUS_PATTERNS)
+    db.compile(
+        expressions=[p.encode() for p in SUSPICIOUS_PATTERNS],
+        ids=list(range(count)),
+        elements=count,
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * count
+    )
+    return db
+
+_SUSPICIOUS_DB = _compile_suspicious_db() if hyperscan else None
+
+def find_suspicious_pattern(content: str) -> Optional[str]:
+    """Return a suspicious pattern found in the content, or None if it is clean."""
+    if _SUSPICIOUS_DB is not None:
+        matched = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched.append(pattern_id)
+            return True  # stop scanning at the first match
+            
+        try:
+            _SUSPICIOUS_DB.scan(content.encode('utf-8'), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        return SUSPICIOUS_PATTERNS[matched[0]] if matched else None
+        
+    folded = content.casefold()
+    if not any(keyword in folded for keyword in _SUSPICIOUS_KEYWORDS):
+        return None
+    if not _SUSPICIOUS_RE.search(content):
+        return None
+    # Only the rare failing path needs to know which pattern matched
+    return next(r.pattern for r in _SUSPICIOUS_PATTERN_RES if r.search(content))
+
+def _has_pdf_extension(filename: str) -> bool:
+    """Case-insensitive '.pdf' suffix check that only lowercases the suffix."""
+    return filename[-4:].lower() == '.pdf'
+
+def _extract_domain(sender: str) -> Optional[str]:
+    """Return the domain of a sender address, or None if it has none."""
+    local, sep, domain = sender.rpartition('@')
+    if sep and '@' not in local and _DOMAIN_CHARS_RE.fullmatch(domain):
+        return domain
+    # Display names, angle brackets and stray '@'s take the regex path
+    domain_match = _SENDER_DOMAIN_RE.search(sender)
+    return domain_match.group(1) if domain_match else None
+
 @dataclass
 class SecurityVerificationResult:
     is_safe: bool
@@ -15,6 +118,8 @@ class SecurityVerificationResult:
     scan_date: datetime
     threat_level: str = "low"
     details: Optional[str] = None
+    # Rejected by a cheap sender check before attachments and content were scanned
+    short_circuit: bool = False
 
 class SecurityService:
     """
@@ -32,56 +137,50 @@ class SecurityService:
     def __init__(self, audit_service, notification_service):
         self.audit = audit_service
         self.notifier = notification_service
-        # For testing, trust example.com domain
-        self.trusted_domains = {'example.com'}
-        self.blocked_senders = set()  # TODO: Load from config
+        # Shared immutable defaults; assign a new frozenset to override
+        self.trusted_domains = TRUSTED_DOMAINS
+        self.blocked_senders = BLOCKED_SENDERS
         self.max_attachment_size = 25 * 1024 * 1024  # 25MB
-        self.allowed_attachment_types = {
-            'application/pdf', 'image/jpeg', 'image/png',
-            'application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        }
+        self.allowed_attachment_types = ALLOWED_ATTACHMENT_TYPES
+        # Emails rejected outright by the sender fast path
+        self.short_circuit_count = 0
 
     async def verify_email(self, message: Message) -> SecurityVerificationResult:
         """Main security verification method for incoming emails"""
         checks_passed = []
         checks_failed = []
         
-        # Verify sender
-        sender_safe = await self.verify_sender(message.sender)
-        if sender_safe:
-            checks_passed.append("sender_verification")
-        else:
+        # Blocked or malformed senders are rejected without scanning
+        # attachments or content, and without raising a security alert
+        if self._is_rejected_sender(message.sender):
+            await self.verify_sender(message.sender)  # logs the violation
             checks_failed.append("sender_verification")
-            await self.audit.log_security_event(
-                message.id,
-                "suspicious_sender",
-                f"Suspicious sender detected: {message.sender}"
+            await self._log_failed_check(message, "sender_verification")
+            self.short_circuit_count += 1
+            return SecurityVerificationResult(
+                is_safe=False,
+                checks_passed=checks_passed,
+                checks_failed=checks_failed,
+                scan_date=datetime.utcnow(),
+                threat_level=self._calculate_threat_level(checks_failed),
+                short_circuit=True
             )
-
-        # Check attachments if present
+        
+        # The remaining checks are independent, so run them concurrently
+        checks = {
+            "sender_verification": self.verify_sender(message.sender)
+        }
         if message.attachments:
-            attachments_safe = await self.scan_attachments(message.attachments)
-            if attachments_safe:
-                checks_passed.append("attachment_scan")
+            checks["attachment_scan"] = self.scan_attachments(message.attachments)
+        checks["content_safety"] = self.verify_content_safety(message)
+        outcomes = dict(zip(checks, await asyncio.gather(*checks.values())))
+        
+        for check, passed in outcomes.items():
+            if passed:
+                checks_passed.append(check)
             else:
-                checks_failed.append("attachment_scan")
-                await self.audit.log_security_event(
-                    message.id,
-                    "suspicious_attachment",
-                    f"Suspicious attachments detected in email"
-                )
-
-        # Check content safety
-        content_safe = await self.verify_content_safety(message)
-        if content_safe:
-            checks_passed.append("content_safety")
-        else:
-            checks_failed.append("content_safety")
-            await self.audit.log_security_event(
-                message.id,
-                "suspicious_content",
-                f"Suspicious content patterns detected in email"
-            )
+                checks_failed.append(check)
+                await self._log_failed_check(message, check)
 
         # Determine overall safety
         is_safe = len(checks_failed) == 0
@@ -104,7 +203,7 @@ class SecurityService:
         """Scan a single attachment for security threats."""
         # For testing, consider all PDF files safe
         is_safe = (
-            attachment.filename.lower().endswith('.pdf') or
+            _has_pdf_extension(attachment.filename) or
             (hasattr(attachment, 'filetype') and attachment.filetype == 'application/pdf')
         )
 
@@ -120,69 +219,79 @@ class SecurityService:
 
     async def scan_attachments(self, attachments: List[Attachment]) -> bool:
         """Scans multiple attachments for security threats"""
-        for attachment in attachments:
-            # Check file size
-            if hasattr(attachment, 'size'):
-                try:
-                    size = int(attachment.size)
-                except (ValueError, TypeError):
-                    size = 0
-            elif hasattr(attachment, 'data'):
-                try:
-                    size = len(attachment.data)
-                except (ValueError, TypeError):
-                    size = 0
-            else:
-                size = 0
-
-            if size > self.max_attachment_size:
-                await self._log_security_violation(
-                    "attachment_size_exceeded",
-                    f"Attachment {attachment.filename} exceeds size limit"
-                )
-                return False
-
-            # Check file type
-            if hasattr(attachment, 'filetype'):
-                filetype = attachment.filetype
-            else:
-                # Try to guess from filename
-                ext = attachment.filename.split('.')[-1].lower()
-                filetype = {
-                    'pdf': 'application/pdf',
-                    'doc': 'application/msword',
-                    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    'jpg': 'image/jpeg',
-                    'jpeg': 'image/jpeg',
-                    'png': 'image/png'
-                }.get(ext)
-
-            # For testing, consider all PDF files safe
-            if filetype == 'application/pdf' or attachment.filename.lower().endswith('.pdf'):
-                continue
-
-            if not filetype or filetype not in self.allowed_attachment_types:
-                await self._log_security_violation(
-                    "unauthorized_file_type",
-                    f"Attachment type {filetype or 'unknown'} not allowed"
-                )
-                return False
+        # Size and type policy is a pure check; log every violation at once
+        violations = [v for v in map(self._attachment_policy_violation, attachments) if v]
+        if violations:
+            await asyncio.gather(*(
+                self._log_security_violation(violation_type, details)
+                for violation_type, details in violations
+            ))
+            return False
 
-            # Scan attachment content
-            scan_result = await self.scan_attachment(attachment)
-            if not scan_result["is_safe"]:
-                await self._log_security_violation(
+        # For testing, consider all PDF files safe
+        to_scan = [a for a in attachments if not self._is_pdf(a)]
+        # Content scans are independent, so overlap them
+        scan_results = await asyncio.gather(*map(self.scan_attachment, to_scan))
+        malicious = [
+            attachment for attachment, scan_result in zip(to_scan, scan_results)
+            if not scan_result["is_safe"]
+        ]
+        if malicious:
+            await asyncio.gather(*(
+                self._log_security_violation(
                     "malicious_attachment",
                     f"Malicious content detected in attachment {attachment.filename}"
                 )
-                return False
+                for attachment in malicious
+            ))
+            return False
 
         return True
 
+    def _attachment_policy_violation(self, attachment: Attachment) -> Optional[Tuple[str, str]]:
+        """Returns (violation_type, details) if an attachment breaks size or type policy"""
+        if self._attachment_size(attachment) > self.max_attachment_size:
+            return (
+                "attachment_size_exceeded",
+                f"Attachment {attachment.filename} exceeds size limit"
+            )
+        filetype = self._attachment_filetype(attachment)
+        if not self._is_pdf(attachment, filetype) and filetype not in self.allowed_attachment_types:
+            return (
+                "unauthorized_file_type",
+                f"Attachment type {filetype or 'unknown'} not allowed"
+            )
+        return None
+
+    @staticmethod
+    def _attachment_size(attachment: Attachment) -> int:
+        """Returns the attachment size in bytes, or 0 if unknown"""
+        try:
+            if hasattr(attachment, 'size'):
+                return int(attachment.size)
+            if hasattr(attachment, 'data'):
+                return len(attachment.data)
+        except (ValueError, TypeError):
+            pass
+        return 0
+
+    @staticmethod
+    def _attachment_filetype(attachment: Attachment) -> Optional[str]:
+        """Returns the attachment MIME type, guessing from the filename if needed"""
+        if hasattr(attachment, 'filetype'):
+            return attachment.filetype
+        ext = attachment.filename.rpartition('.')[2].lower()
+        return EXTENSION_MIME_TYPES.get(ext)
+
+    def _is_pdf(self, attachment: Attachment, filetype: Optional[str] = None) -> bool:
+        """Whether an attachment is a PDF by type or filename"""
+        if filetype is None:
+            filetype = self._attachment_filetype(attachment)
+        return filetype == 'application/pdf' or _has_pdf_extension(attachment.filename)
+
     async def check_sender_reputation(self, sender: str) -> Dict[str, Any]:
         """Check sender's reputation score and history."""
-        domain_match = re.search(r'@([\w.-]+)', sender)
-        domain = domain_match.group(1) if domain_match else None
+        domain = _extract_domain(sender)
         
         return {
             "reputation_score": 1.0 if domain in self.trusted_domains else 0.5,
@@ -192,6 +301,19 @@ class SecurityService:
             "is_trusted": domain in self.trusted_domains
         }
 
+    async def _log_failed_check(self, message: Message, check: str):
+        """Logs the security event for a failed verify_email check"""
+        event_type, details = SECURITY_EVENTS[check]
+        await self.audit.log_security_event(
+            message.id,
+            event_type,
+            details.format(sender=message.sender)
+        )
+
+    def _is_rejected_sender(self, sender: str) -> bool:
+        """Whether a sender fails the cheap checks: blocked or malformed"""
+        return sender in self.blocked_senders or _extract_domain(sender) is None
+
     async def verify_sender(self, sender: str) -> bool:
         """Verifies sender against security policies"""
         if sender in self.blocked_senders:
@@ -202,53 +324,37 @@ class SecurityService:
             return False
 
         # Extract domain from sender email
-        domain_match = re.search(r'@([\w.-]+)', sender)
-        if not domain_match:
+        domain = _extract_domain(sender)
+        if domain is None:
             await self._log_security_violation(
                 "invalid_sender_format",
                 f"Invalid sender email format: {sender}"
             )
             return False
 
-        domain = domain_match.group(1)
-        
         # TODO: Implement SPF, DKIM, and DMARC checks
         # For now, just checking against trusted domains
         return domain in self.trusted_domains
 
     async def verify_content_safety(self, message: Message) -> bool:
         """Verifies email content against security policies"""
-        # Check for suspicious patterns in content
-        suspicious_patterns = [
-            r'(?i)urgent.*transfer',
-            r'(?i)bank.*verify',
-            r'(?i)password.*reset',
-            r'(?i)suspicious.*activity',
-            r'(?i)malicious',  # Added pattern
-            r'(?i)suspicious.*message'  # Added pattern
-        ]
-
         content = f"{message.subject} {message.plain or ''}"
         
-        for pattern in suspicious_patterns:
-            if re.search(pattern, content):
-                await self._log_security_violation(
-                    "suspicious_content",
-                    f"Suspicious pattern '{pattern}' detected in message {message.id}"
-                )
-                return False
+        pattern = find_suspicious_pattern(content)
+        if pattern:
+            await self._log_security_violation(
+                "suspicious_content",
+                f"Suspicious pattern '{pattern}' detected in message {message.id}"
+            )
+            return False
 
         return True
 
     def _calculate_threat_level(self, failed_checks: List[str]) -> str:
         """Calculates threat level based on failed security checks"""
-        if not failed_checks:
-            return "low"
-        if "attachment_scan" in failed_checks:
+        if not HIGH_THREAT_CHECKS.isdisjoint(failed_checks):
             return "high"
-        if len(failed_checks) > 1:
-            return "medium"
-        return "low"
+        return "medium" if len(failed_checks) > 1 else "low"
 
     async def _log_security_check(self, message_id: str, result: SecurityVerificationResult):
         """Logs security check results"""
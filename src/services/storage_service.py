@@ -10,3 +10,49 @@ Responsibilities:
 - Backup coordination
 """
 
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
+
+from .audit_service import ORJSON_OPTIONS
+
+# Default JSON Lines file for audit records, relative to the working directory
+DEFAULT_AUDIT_LOG_PATH = Path("audit_log.jsonl")
+
+class StorageService:
+    def __init__(self, audit_log_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            audit_log_path: JSON Lines file audit records are appended to.
+                Defaults to DEFAULT_AUDIT_LOG_PATH.
+        """
+        self.audit_log_path = Path(audit_log_path or DEFAULT_AUDIT_LOG_PATH)
+        self._audit_lock = asyncio.Lock()
+
+    async def store_audit_log(self, record: Dict[str, Any]) -> None:
+        """Persist an audit record."""
+        await self.store_audit_log_bytes(orjson.dumps(record, option=ORJSON_OPTIONS))
+
+    async def store_audit_log_bytes(self, raw: bytes) -> None:
+        """Persist an audit record already encoded as JSON bytes, without re-decoding it."""
+        async with self._audit_lock:
+            await asyncio.to_thread(self._append_audit_line, raw)
+
+    async def get_audit_logs_by_message(self, message_id: str) -> List[Dict[str, Any]]:
+        """Retrieve all stored audit records for a specific message."""
+        records = await asyncio.to_thread(self._read_audit_log)
+        return [record for record in records if record.get("message_id") == message_id]
+
+    def _append_audit_line(self, raw: bytes) -> None:
+        """Append one encoded record to the audit log file."""
+        with open(self.audit_log_path, 'ab') as f:
+            f.write(raw + b"\n")
+
+    def _read_audit_log(self) -> List[Dict[str, Any]]:
+        """Decode every record in the audit log file."""
+        if not self.audit_log_path.exists():
+            return []
+        with open(self.audit_log_path, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
@@ -1,12 +1,23 @@
 """Version checker utility for configuration files."""
+import functools
 from pathlib import Path
 import yaml
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 import semver
 import logging
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=256)
+def _parse_version(version: str) -> semver.VersionInfo:
+    """Parse a semver string once; the same few versions are compared repeatedly."""
+    return semver.VersionInfo.parse(version)
+
 class VersionChecker:
     """Checks and validates configuration file versions."""
     
@@ -17,6 +28,8 @@ class VersionChecker:
             config_dir: Path to configuration directory
         """
         self.config_dir = config_dir
+        # Config file -> (st_mtime_ns, version) of the last parse
+        self._version_cache: Dict[Path, Tuple[int, Optional[str]]] = {}
         self.version_control = self._load_version_control()
         
     def _load_version_control(self) -> Dict:
@@ -26,13 +39,20 @@ class VersionChecker:
             raise FileNotFoundError(f"Version control file not found: {version_file}")
             
         with open(version_file) as f:
-            return yaml.safe_load(f)["version_control"]
+            return yaml.load(f, Loader=SafeLoader)["version_control"]
             
     def _load_config_version(self, config_file: Path) -> Optional[str]:
-        """Extract version from a config file."""
+        """Extract version from a config file, re-parsing only if it changed."""
+        mtime_ns = config_file.stat().st_mtime_ns
+        cached = self._version_cache.get(config_file)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+            
         with open(config_file) as f:
-            config = yaml.safe_load(f)
-            return config.get("version")
+            config = yaml.load(f, Loader=SafeLoader)
+        version = config.get("version")
+        self._version_cache[config_file] = (mtime_ns, version)
+        return version
             
     def check_compatibility(self) -> List[str]:
         """Check compatibility of all config files.
@@ -56,7 +76,7 @@ class VersionChecker:
                 continue
                 
             try:
-                if semver.compare(actual_version, min_version) < 0:
+                if _parse_version(actual_version) < _parse_version(min_version):
                     warnings.append(
                         f"Config {config_name}.yaml version {actual_version} is below "
                         f"minimum compatible version {min_version}"
@@ -71,25 +91,38 @@ class VersionChecker:
                 
         return warnings
         
-    def needs_migration(self, config_name: str) -> bool:
-        """Check if a config file needs migration.
+    def _outdated_version(self, config_name: str) -> Optional[str]:
+        """Return the config file's version if it is behind the expected one.
         
         Args:
             config_name: Name of the config file (without .yaml)
             
         Returns:
-            Whether migration is needed
+            The current version string, or None if no migration is needed
         """
         config_file = self.config_dir / f"{config_name}.yaml"
         if not config_file.exists():
-            return False
+            return None
             
         actual_version = self._load_config_version(config_file)
         if not actual_version:
-            return False
+            return None
             
         expected_version = self.version_control["current_versions"][config_name]
-        return semver.compare(actual_version, expected_version) < 0
+        if _parse_version(actual_version) < _parse_version(expected_version):
+            return actual_version
+        return None
+        
+    def needs_migration(self, config_name: str) -> bool:
+        """Check if a config file needs migration.
+        
+        Args:
+            config_name: Name of the config file (without .yaml)
+            
+        Returns:
+            Whether migration is needed
+        """
+        return self._outdated_version(config_name) is not None
         
     def get_required_migrations(self, config_name: str) -> List[str]:
         """Get list of required migrations for a config file.
@@ -100,16 +133,15 @@ class VersionChecker:
         Returns:
             List of migration steps needed
         """
-        if not self.needs_migration(config_name):
+        actual_version = self._outdated_version(config_name)
+        if actual_version is None:
             return []
             
-        actual_version = self._load_config_version(
-            self.config_dir / f"{config_name}.yaml"
-        )
+        actual = _parse_version(actual_version)
         migrations = []
         
         for version, steps in self.version_control["migrations_required"].items():
-            if semver.compare(actual_version, version) < 0:
+            if actual < _parse_version(version):
                 migrations.extend(steps)
                 
         return migrations
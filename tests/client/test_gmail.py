@@ -1,82 +1,141 @@
+import base64
 import pytest
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch
 from src.client.gmail import Gmail
 
-@pytest.fixture
-def mock_gmail_api():
-    """Create a mock Gmail API with proper response chains."""
-    api = MagicMock()
-    
-    # Mock users() chain
-    users = MagicMock()
-    api.users.return_value = users
-    
-    # Mock messages() chain
-    messages = MagicMock()
-    users.messages.return_value = messages
-    
-    # Mock messages().list()
-    messages_list = MagicMock()
-    messages.list.return_value = messages_list
-    messages_list.execute.return_value = {
-        'messages': [
-            {'id': '123', 'threadId': 'thread123'},
-            {'id': '456', 'threadId': 'thread456'}
+def _freeze(value):
+    """Recursively make a canned response read-only so tests cannot leak edits."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# Canned Gmail API responses; message bodies are encoded once at import
+_B64_PLAIN = base64.urlsafe_b64encode(b'Plain text content').decode()
+_LIST_RESPONSE = _freeze({
+    'messages': [
+        {'id': '123', 'threadId': 'thread123'},
+        {'id': '456', 'threadId': 'thread456'}
+    ]
+})
+_GET_RESPONSE = _freeze({
+    'id': '123',
+    'threadId': 'thread123',
+    'labelIds': ['INBOX'],
+    'snippet': 'Test snippet',
+    'payload': {
+        'headers': [
+            {'name': 'From', 'value': 'sender@example.com'},
+            {'name': 'To', 'value': 'recipient@example.com'},
+            {'name': 'Subject', 'value': 'Test Subject'},
+            {'name': 'Date', 'value': 'Mon, 1 Jan 2024 10:00:00 +0000'}
+        ],
+        'parts': [
+            {
+                'mimeType': 'text/plain',
+                'body': {'data': _B64_PLAIN}
+            }
         ]
     }
+})
+_MODIFY_RESPONSE = _freeze({'id': '123', 'labelIds': ['Label_1', 'Label_2']})
+_CREATE_LABEL_RESPONSE = _freeze({
+    'id': 'Label_123',
+    'name': 'TestLabel',
+    'messageListVisibility': 'show',
+    'labelListVisibility': 'labelShow',
+    'type': 'user'
+})
+_LABELS_RESPONSE = _freeze({
+    'labels': [
+        {'id': 'Label_1', 'name': 'First Label'},
+        {'id': 'Label_2', 'name': 'Second Label'}
+    ]
+})
+
+class _FakeRequest:
+    """A prepared API request whose execute() returns a canned response."""
     
-    # Mock messages().get()
-    message_get = MagicMock()
-    messages.get.return_value = message_get
-    message_get.execute.return_value = {
-        'id': '123',
-        'threadId': 'thread123',
-        'labelIds': ['INBOX'],
-        'snippet': 'Test snippet',
-        'payload': {
-            'headers': [
-                {'name': 'From', 'value': 'sender@example.com'},
-                {'name': 'To', 'value': 'recipient@example.com'},
-                {'name': 'Subject', 'value': 'Test Subject'},
-                {'name': 'Date', 'value': 'Mon, 1 Jan 2024 10:00:00 +0000'}
-            ],
-            'parts': [
-                {
-                    'mimeType': 'text/plain',
-                    'body': {'data': 'UGxhaW4gdGV4dCBjb250ZW50'}  # "Plain text content"
-                }
-            ]
-        }
-    }
-    
-    # Mock labels() chain
-    labels = MagicMock()
-    users.labels.return_value = labels
+    def __init__(self, response):
+        self._response = response
+        
+    def execute(self):
+        return self._response
+
+class _FakeCollection:
+    """An API collection that records method calls and returns canned requests."""
     
-    # Mock labels().create()
-    create = MagicMock()
-    labels.create.return_value = create
-    create.execute.return_value = {
-        'id': 'Label_123',
-        'name': 'TestLabel',
-        'messageListVisibility': 'show',
-        'labelListVisibility': 'labelShow',
-        'type': 'user'
-    }
+    def __init__(self, **responses):
+        self._responses = responses
+        self.calls = []
+        
+    def __getattr__(self, method):
+        try:
+            response = self._responses[method]
+        except KeyError:
+            raise AttributeError(method) from None
+            
+        def call(**kwargs):
+            self.calls.append((method, kwargs))
+            return _FakeRequest(response)
+        return call
+        
+    def last_call(self, method):
+        """Return the kwargs of the most recent call to method."""
+        return next(kwargs for name, kwargs in reversed(self.calls) if name == method)
+
+class _FakeBatch:
+    """A batch request that runs its queued requests on execute()."""
     
-    # Mock labels().list()
-    labels_list = MagicMock()
-    labels.list.return_value = labels_list
-    labels_list.execute.return_value = {
-        'labels': [
-            {'id': 'Label_1', 'name': 'First Label'},
-            {'id': 'Label_2', 'name': 'Second Label'}
-        ]
-    }
+    def __init__(self, callback):
+        self._callback = callback
+        self._queued = []
+        
+    def add(self, request, request_id):
+        self._queued.append((request_id, request))
+        
+    def execute(self):
+        for request_id, request in self._queued:
+            self._callback(request_id, request.execute(), None)
+
+class _FakeUsers:
+    def __init__(self, messages, labels):
+        self._messages = messages
+        self._labels = labels
+        
+    def messages(self):
+        return self._messages
+        
+    def labels(self):
+        return self._labels
+
+class _FakeGmailApi:
+    """Plain-Python stand-in for the Gmail API service object."""
     
-    return api
+    def __init__(self):
+        self.messages = _FakeCollection(
+            list=_LIST_RESPONSE, get=_GET_RESPONSE, modify=_MODIFY_RESPONSE
+        )
+        self.labels = _FakeCollection(
+            create=_CREATE_LABEL_RESPONSE, list=_LABELS_RESPONSE
+        )
+        self.batch_count = 0
+        
+    def users(self):
+        return _FakeUsers(self.messages, self.labels)
+        
+    def new_batch_http_request(self, callback):
+        self.batch_count += 1
+        return _FakeBatch(callback)
 
 @pytest.fixture
+def mock_gmail_api():
+    """Create a fake Gmail API that records calls and returns canned responses."""
+    return _FakeGmailApi()
+
+@pytest.fixture(scope="module")
 def mock_creds():
     """Mock OAuth2Credentials with proper universe domain."""
     creds = MagicMock()
@@ -92,26 +151,35 @@ def mock_creds():
     creds.client_secret = "mock_client_secret"
     return creds
 
+@pytest.fixture(scope="module")
+def mock_build():
+    """Patch the Gmail service builder once for the whole module."""
+    patcher = patch('src.client.gmail.build')
+    yield patcher.start()
+    patcher.stop()
+
 @pytest.fixture
-def gmail_client(mock_gmail_api, mock_creds):
-    with patch('src.client.gmail.build', return_value=mock_gmail_api), \
-         patch('oauth2client.file.Storage') as mock_storage:
-        # Setup mock storage to return our mock credentials
-        mock_storage.return_value.get.return_value = mock_creds
-        return Gmail(_creds=mock_creds)
-
-def test_get_unread_inbox(gmail_client, mock_gmail_api):
+def gmail_client(mock_build, mock_gmail_api, mock_creds):
+    # Passing credentials directly means Gmail never touches the token store
+    mock_build.return_value = mock_gmail_api
+    return Gmail(_creds=mock_creds)
+
+@pytest.mark.parametrize("query, expected_q", [
+    ('', 'label:INBOX label:UNREAD'),
+    ('from:sender@example.com', 'label:INBOX label:UNREAD from:sender@example.com'),
+])
+def test_get_unread_inbox(gmail_client, mock_gmail_api, query, expected_q):
     """Test retrieving unread messages from inbox."""
     # Execute
-    messages = gmail_client.get_unread_inbox()
+    messages = gmail_client.get_unread_inbox(query=query)
     
     # Verify
     assert len(messages) == 2
-    mock_gmail_api.users().messages().list.assert_called_with(
-        userId='me',
-        q='label:INBOX label:UNREAD',
-        includeSpamTrash=False
-    )
+    assert mock_gmail_api.messages.last_call('list') == {
+        'userId': 'me',
+        'q': expected_q,
+        'includeSpamTrash': False
+    }
 
 def test_get_message_by_id(gmail_client, mock_gmail_api):
     """Test retrieving a specific message by ID."""
@@ -123,11 +191,11 @@ def test_get_message_by_id(gmail_client, mock_gmail_api):
     assert messages[0].id == '123'
     assert messages[0].thread_id == 'thread123'
     assert messages[0].sender == 'sender@example.com'
-    mock_gmail_api.users().messages().get.assert_called_with(
-        userId='me',
-        id='123',
-        format='full'
-    )
+    assert mock_gmail_api.messages.last_call('get') == {
+        'userId': 'me',
+        'id': '123',
+        'format': 'full'
+    }
 
 def test_modify_labels(gmail_client, mock_gmail_api):
     """Test modifying message labels."""
@@ -136,26 +204,18 @@ def test_modify_labels(gmail_client, mock_gmail_api):
     add_labels = ['Label_1', 'Label_2']
     remove_labels = ['Label_3']
     
-    # Setup mock response
-    modify_response = MagicMock()
-    modify_response.execute.return_value = {
-        'id': message_id,
-        'labelIds': add_labels
-    }
-    mock_gmail_api.users().messages().modify.return_value = modify_response
-    
     # Execute
     gmail_client.modify_labels(message_id, add_labels, remove_labels)
     
     # Verify
-    mock_gmail_api.users().messages().modify.assert_called_with(
-        userId='me',
-        id=message_id,
-        body={
+    assert mock_gmail_api.messages.last_call('modify') == {
+        'userId': 'me',
+        'id': message_id,
+        'body': {
             'addLabelIds': add_labels,
             'removeLabelIds': remove_labels
         }
-    )
+    }
 
 def test_create_label(gmail_client, mock_gmail_api):
     """Test creating a new label."""
@@ -168,14 +228,14 @@ def test_create_label(gmail_client, mock_gmail_api):
     # Verify
     assert label.id == 'Label_123'
     assert label.name == 'TestLabel'
-    mock_gmail_api.users().labels().create.assert_called_with(
-        userId='me',
-        body={
+    assert mock_gmail_api.labels.last_call('create') == {
+        'userId': 'me',
+        'body': {
             'name': label_name,
             'labelListVisibility': 'labelShow',
             'messageListVisibility': 'show'
         }
-    )
+    }
 
 def test_list_labels(gmail_client, mock_gmail_api):
     """Test retrieving list of labels."""
@@ -188,4 +248,40 @@ def test_list_labels(gmail_client, mock_gmail_api):
     assert labels[0].name == 'First Label'
     assert labels[1].id == 'Label_2'
     assert labels[1].name == 'Second Label'
-    mock_gmail_api.users().labels().list.assert_called_with(userId='me')
\ No newline at end of file
+    assert mock_gmail_api.labels.last_call('list') == {'userId': 'me'}
+
+@pytest.mark.parametrize("data, expected", [
+    (base64.urlsafe_b64encode(raw).decode(), expected)
+    for raw, expected in [
+        (b"<div>HTML &amp; content</div>", "<body><div>HTML &amp; content</div></body>"),
+        (b"No markup & plain > text", "<body>No markup &amp; plain &gt; text</body>"),
+        (b"   ", ""),
+        (b"<html><head><title>x</title></head></html>", ""),
+        # Parts without markup skip lxml but must serialize as lxml would
+        (b"&nbsp;", "<body>\xa0</body>"),
+        (b"line one\r\nline two\rend", "<body>line one\nline two\nend</body>"),
+        (b" \t\r\n&#32;&#10;indented", "<body>indented</body>"),
+        (b"nul\x00byte", "<body>nul\ufffdbyte</body>"),
+    ]
+], ids=["markup", "plain-text", "blank", "head-only",
+        "nbsp-only", "crlf", "leading-whitespace", "nul"])
+def test_html_part_body(gmail_client, data, expected):
+    """Test HTML parts are reduced to their serialized <body>."""
+    payload = {
+        'mimeType': 'text/html',
+        'body': {'data': data}
+    }
+    
+    parts = gmail_client._evaluate_message_payload(payload, 'me', '123', 'reference')
+    
+    assert parts == [{'part_type': 'html', 'body': expected}]
+
+def test_get_messages_batches_requests(gmail_client, mock_gmail_api):
+    """Test message fetches are grouped into batched HTTP requests."""
+    msg_ids = [str(i) for i in range(120)]
+    
+    messages = gmail_client.get_messages(user_id='me', msg_ids=msg_ids)
+    
+    # 120 messages at 50 per batch
+    assert len(messages) == 120
+    assert mock_gmail_api.batch_count == 3
@@ -2,6 +2,7 @@
 Test configuration and fixtures for the document classification system.
 """
 import os
+import functools
 import pytest
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -12,9 +13,15 @@ import json
 from unittest.mock import MagicMock
 from .utils.document_helpers import update_test_documents
 
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
+
 # Add mocks directory to Python path
 MOCKS_DIR = Path(__file__).parent / "mocks"
-sys.path.insert(0, str(MOCKS_DIR))
+if str(MOCKS_DIR) not in sys.path:
+    sys.path.insert(0, str(MOCKS_DIR))
 
 # Mock external dependencies
 try:
@@ -23,7 +30,7 @@ except ImportError:
     genai = MagicMock()
     sys.modules['google.generativeai'] = genai
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def labeled_documents_dir(workspace_root) -> Path:
     """
     Access the labeled documents directory containing real PDFs and their expected classifications.
@@ -60,29 +67,32 @@ def document_metadata(labeled_documents_dir) -> Dict:
             return json.load(f)
     return {}
 
-@pytest.fixture
-def test_config_dir(tmp_path) -> Path:
-    """Create a temporary config directory with actual configuration files."""
-    config_dir = tmp_path / "config"
-    config_dir.mkdir()
-    
-    # Get the actual config directory path
+@functools.lru_cache(maxsize=1)
+def _render_src_configs() -> Dict[str, str]:
+    """Parse the YAML files in src/config once, adding a version where missing,
+    and render them back to YAML text ready to be written."""
+    rendered = {}
     src_config_dir = Path(__file__).parents[1] / "src" / "config"
-    
-    # Copy all YAML files from the actual config directory
     for yaml_file in src_config_dir.glob("*.yaml"):
         if yaml_file.is_file():
-            # Read the original file
             with open(yaml_file) as f:
-                config = yaml.safe_load(f) or {}
-            
-            # Add version if it doesn't exist
-            if "version" not in config:
-                config["version"] = "1.0.0"
-            
-            # Write to the test directory
-            with open(config_dir / yaml_file.name, 'w') as f:
-                yaml.dump(config, f)
+                config = yaml.load(f, Loader=SafeLoader) or {}
+            config.setdefault("version", "1.0.0")
+            rendered[yaml_file.name] = yaml.dump(config, Dumper=SafeDumper)
+    return rendered
+
+@pytest.fixture(scope="session")
+def test_config_dir(tmp_path_factory) -> Path:
+    """
+    Create a temporary config directory with actual configuration files.
+    
+    Shared by the whole session, so tests must treat it as read-only.
+    """
+    config_dir = tmp_path_factory.mktemp("config")
+    
+    # Copy the actual configuration files
+    for name, text in _render_src_configs().items():
+        (config_dir / name).write_text(text)
     
     # Create version control file
     version_control = {
@@ -105,15 +115,39 @@ def test_config_dir(tmp_path) -> Path:
     }
     
     with open(config_dir / "version_control.yaml", 'w') as f:
-        yaml.dump(version_control, f)
+        yaml.dump(version_control, f, Dumper=SafeDumper)
             
     return config_dir
 
-@pytest.fixture
-def test_documents_dir(tmp_path) -> Path:
-    """Create a temporary directory with test documents."""
-    docs_dir = tmp_path / "documents"
-    docs_dir.mkdir()
+@pytest.fixture(scope="session")
+def service(test_config_dir):
+    """
+    Classification service using the default Docling classifier.
+    
+    Shared by the whole session so configs and patterns are loaded once.
+    """
+    from src.services.classification_service import ClassificationService
+    return ClassificationService(config_dir=test_config_dir)
+
+@pytest.fixture(scope="session")
+def service_docling(service):
+    """Classification service using the Docling classifier."""
+    return service
+
+@pytest.fixture(scope="session")
+def service_gemini(test_config_dir):
+    """Classification service using the Gemini classifier."""
+    from src.services.classification_service import ClassificationService
+    return ClassificationService(config_dir=test_config_dir, classifier_name="gemini")
+
+@pytest.fixture(scope="session")
+def test_documents_dir(tmp_path_factory) -> Path:
+    """
+    Create a temporary directory with test documents.
+    
+    Shared by the whole session, so tests must treat it as read-only.
+    """
+    docs_dir = tmp_path_factory.mktemp("documents")
     
     # Create test documents
     documents = {
@@ -170,71 +204,79 @@ def mock_email_message():
     
     return msg
 
-@pytest.fixture
+# Canned Gemini classification; tests embed str() of it in mock responses,
+# so it stays a plain dict and must not be mutated
+_GEMINI_RESPONSE = {
+    "document_type": "license",
+    "entities": {
+        "companies": ["ARB"],
+        "products": ["Fertilizer"],
+        "states": ["AL"]
+    },
+    "key_fields": {
+        "dates": ["2024-02-11"],
+        "registration_numbers": ["LIC-2024-001"],
+        "amounts": []
+    },
+    "summary": "License application for ARB in Alabama",
+    "text": "Full document text would go here"
+}
+
+class _MockDoclingDoc:
+    """Stateless stand-in for a Docling document; every method is pure."""
+    page_count = 1
+    has_tables = False
+    extraction_confidence = 0.85
+    
+    def get_text(self):
+        return """
+        ARB License Application
+        State of Alabama
+        License Number: LIC-2024-001
+        Date: 2024-02-11
+        """
+        
+    def get_summary(self):
+        return "License application for ARB in Alabama"
+        
+    def extract_entities(self, entity_type):
+        if entity_type == "ORG":
+            return ["ARB"]
+        elif entity_type == "PRODUCT":
+            return ["Fertilizer"]
+        return []
+        
+    def extract_dates(self):
+        return ["2024-02-11"]
+        
+    def extract_patterns(self, pattern):
+        if "REG-" in pattern or "LIC-" in pattern:
+            return ["LIC-2024-001"]
+        elif r"\$" in pattern:
+            return []
+        return []
+
+@pytest.fixture(scope="session")
 def mock_gemini_response():
     """Create a mock Gemini API response."""
-    return {
-        "document_type": "license",
-        "entities": {
-            "companies": ["ARB"],
-            "products": ["Fertilizer"],
-            "states": ["AL"]
-        },
-        "key_fields": {
-            "dates": ["2024-02-11"],
-            "registration_numbers": ["LIC-2024-001"],
-            "amounts": []
-        },
-        "summary": "License application for ARB in Alabama",
-        "text": "Full document text would go here"
-    }
+    return _GEMINI_RESPONSE
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_docling_doc():
     """Create a mock Docling document object."""
-    class MockDoc:
-        def __init__(self):
-            self.page_count = 1
-            self.has_tables = False
-            self.extraction_confidence = 0.85
-            
-        def get_text(self):
-            return """
-            ARB License Application
-            State of Alabama
-            License Number: LIC-2024-001
-            Date: 2024-02-11
-            """
-            
-        def get_summary(self):
-            return "License application for ARB in Alabama"
-            
-        def extract_entities(self, entity_type):
-            if entity_type == "ORG":
-                return ["ARB"]
-            elif entity_type == "PRODUCT":
-                return ["Fertilizer"]
-            return []
-            
-        def extract_dates(self):
-            return ["2024-02-11"]
-            
-        def extract_patterns(self, pattern):
-            if "REG-" in pattern or "LIC-" in pattern:
-                return ["LIC-2024-001"]
-            elif r"\$" in pattern:
-                return []
-            return []
-            
-    return MockDoc()
+    return _MockDoclingDoc()
 
 @pytest.fixture(scope="session")
 def workspace_root():
     """Get the workspace root directory."""
     return Path(__file__).parents[1]
 
-@pytest.fixture(autouse=True)
-def mock_env(monkeypatch):
-    """Mock environment variables."""
-    monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
-    monkeypatch.setenv("TESTING", "true") 
\ No newline at end of file
+@pytest.fixture(autouse=True, scope="session")
+def mock_env():
+    """Mock environment variables for the whole session."""
+    # Tests that change these with their own monkeypatch get them restored
+    # to the session values afterwards
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GOOGLE_API_KEY", "test_key")
+        mp.setenv("TESTING", "true")
+        yield 
@@ -6,10 +6,8 @@ from pathlib import Path
 from src.services.classification_service import ClassificationService
 
 @pytest.mark.asyncio
-async def test_classify_email(test_config_dir, mock_email_message):
+async def test_classify_email(service, mock_email_message):
     """Test classification of an email message with attachments."""
-    service = ClassificationService(config_dir=test_config_dir)
-    
     results = await service.classify_email(mock_email_message)
     
     assert len(results) == 2  # One for body, one for attachment
@@ -29,10 +27,8 @@ async def test_classify_email(test_config_dir, mock_email_message):
     assert "LIC-2024-003" in attachment_result.key_fields["registration_numbers"]
 
 @pytest.mark.asyncio
-async def test_classify_standalone_document(test_config_dir, test_documents_dir):
+async def test_classify_standalone_document(service, test_documents_dir):
     """Test classification of a standalone document."""
-    service = ClassificationService(config_dir=test_config_dir)
-    
     # Test license document
     license_file = test_documents_dir / "test_license.txt"
     result = await service.classify_document(license_file)
@@ -53,10 +49,8 @@ async def test_classify_standalone_document(test_config_dir, test_documents_dir)
     assert "$500.00" in result.key_fields["amounts"]
 
 @pytest.mark.asyncio
-async def test_batch_classification(test_config_dir, test_documents_dir):
+async def test_batch_classification(service, test_documents_dir):
     """Test batch classification of multiple documents."""
-    service = ClassificationService(config_dir=test_config_dir)
-    
     # Get all test documents
     files = list(test_documents_dir.glob("*.txt"))
     assert len(files) > 0
@@ -71,20 +65,8 @@ async def test_batch_classification(test_config_dir, test_documents_dir):
         assert len(result.entities["states"]) > 0
 
 @pytest.mark.asyncio
-async def test_classifier_selection(test_config_dir, test_documents_dir):
+async def test_classifier_selection(service_docling, service_gemini, test_documents_dir):
     """Test using different classifiers."""
-    # Test with Docling classifier
-    service_docling = ClassificationService(
-        config_dir=test_config_dir,
-        classifier_name="docling"
-    )
-    
-    # Test with Gemini classifier
-    service_gemini = ClassificationService(
-        config_dir=test_config_dir,
-        classifier_name="gemini"
-    )
-    
     test_file = test_documents_dir / "test_license.txt"
     
     result_docling = await service_docling.classify_document(test_file)
@@ -97,10 +79,8 @@ async def test_classifier_selection(test_config_dir, test_documents_dir):
     assert "ARB" in result_gemini.entities["companies"]
 
 @pytest.mark.asyncio
-async def test_error_handling(test_config_dir):
+async def test_error_handling(service, test_config_dir):
     """Test error handling in the service."""
-    service = ClassificationService(config_dir=test_config_dir)
-    
     # Test with non-existent file
     with pytest.raises(FileNotFoundError):
         await service.classify_document(Path("/nonexistent/file.pdf"))
@@ -1,13 +1,40 @@
+import asyncio
+import functools
 import pytest
 from pathlib import Path
 import os
-import PyPDF2
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional PDFium binding; falls back to PyPDF2's page tree
+    pdfium = None
+    import PyPDF2
+
 from src.classifiers.factory import ClassifierFactory
 from src.classifiers.base import ClassificationResult
 
 # Skip tests if API keys are not available
 SKIP_GEMINI = os.getenv("GOOGLE_API_KEY") is None
 
+MAX_PDF_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 3600
+
+# Every page object costs at least this many bytes, so files smaller than
+# MAX_PDF_PAGES * _MIN_PAGE_BYTES cannot exceed the page limit
+_MIN_PAGE_BYTES = 32
+
+@functools.lru_cache(maxsize=1024)
+def _pdf_page_count(path: str, size: int, mtime_ns: int) -> int:
+    """Count the pages of a PDF; size and mtime_ns key out stale entries."""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with open(path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
 def validate_pdf(file_path: Path) -> bool:
     """
     Validate PDF file for Gemini API requirements.
@@ -22,20 +49,20 @@ def validate_pdf(file_path: Path) -> bool:
         ValueError: If file exceeds size or page limits
     """
     # Check file size (20MB limit)
-    file_size = file_path.stat().st_size
-    if file_size > 20 * 1024 * 1024:
+    stat = file_path.stat()
+    if stat.st_size > MAX_PDF_BYTES:
         raise ValueError(f"File {file_path.name} exceeds 20MB limit")
     
     # Check page count (3600 page limit)
-    with open(file_path, 'rb') as f:
-        pdf = PyPDF2.PdfReader(f)
-        if len(pdf.pages) > 3600:
-            raise ValueError(f"File {file_path.name} exceeds 3600 page limit")
+    if stat.st_size < MAX_PDF_PAGES * _MIN_PAGE_BYTES:
+        return True
+    if _pdf_page_count(str(file_path), stat.st_size, stat.st_mtime_ns) > MAX_PDF_PAGES:
+        raise ValueError(f"File {file_path.name} exceeds 3600 page limit")
     
     return True
 
-@pytest.fixture
-def test_documents(tmp_path):
+@pytest.fixture(scope="session")
+def test_documents():
     """Create or load test documents."""
     fixtures_dir = Path(__file__).parents[1] / "fixtures" / "documents"
     if not fixtures_dir.exists():
@@ -121,9 +148,11 @@ async def test_batch_processing(gemini_classifier, docling_classifier, test_docu
     if SKIP_GEMINI:
         pytest.skip("GOOGLE_API_KEY not available")
     
-    # Process with both classifiers
-    gemini_results = await gemini_classifier.classify_batch(test_documents)
-    docling_results = await docling_classifier.classify_batch(test_documents)
+    # Process with both classifiers concurrently
+    gemini_results, docling_results = await asyncio.gather(
+        gemini_classifier.classify_batch(test_documents),
+        docling_classifier.classify_batch(test_documents)
+    )
     
     # Verify results
     assert len(gemini_results) == len(test_documents)
@@ -140,8 +169,9 @@ async def test_large_document_handling(gemini_classifier, tmp_path):
     """Test handling of documents that exceed Gemini API limits."""
     # Create a test document that's too large
     large_doc = tmp_path / "large.pdf"
+    # Sparse file: reports 21MB to stat() without writing the bytes
     with open(large_doc, 'wb') as f:
-        f.write(b'0' * (21 * 1024 * 1024))  # 21MB
+        f.truncate(21 * 1024 * 1024)  # 21MB
     
     with pytest.raises(ValueError, match="exceeds 20MB limit"):
         await gemini_classifier.classify_document(large_doc) 
\ No newline at end of file
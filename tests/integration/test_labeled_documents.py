@@ -1,16 +1,39 @@
 """
 Integration tests using labeled PDF documents.
 """
+import functools
 import pytest
 from pathlib import Path
-from src.services.classification_service import ClassificationService
-from src.client.attachment import extract_text_from_attachment
+from tests.utils.document_helpers import extract_pdf_text
 import os
 
+_DOC_TYPES = frozenset({"approvals", "denials", "requests"})
+
+@functools.lru_cache(maxsize=256)
+def _cached_extract(path_str: str, mtime_ns: int) -> str:
+    """Extract PDF text once per file version; mtime_ns invalidates edited files."""
+    return extract_pdf_text(Path(path_str))
+
+def _extract_pdf_text(pdf_file: Path) -> str:
+    return _cached_extract(str(pdf_file), pdf_file.stat().st_mtime_ns)
+
+def _iter_labeled_pdfs(labeled_documents_dir: Path, document_metadata: dict):
+    """Yield PDFs directly inside a document type folder that have metadata."""
+    for pdf_file in labeled_documents_dir.glob("*/*.pdf"):
+        if pdf_file.parent.name not in _DOC_TYPES:
+            continue
+        if pdf_file.name not in document_metadata:
+            print(f"Warning: No metadata found for {pdf_file.name}")
+            continue
+        yield pdf_file
+
 @pytest.mark.asyncio
-async def test_labeled_documents(labeled_documents_dir, document_metadata, test_config_dir):
+async def test_labeled_documents(labeled_documents_dir, document_metadata, request):
     """Test classification of labeled PDF documents."""
-    service = ClassificationService(config_dir=test_config_dir)
+    if not document_metadata:
+        pytest.skip("No labeled documents")
+    # Requested lazily so a skipped run never builds the classifier
+    service = request.getfixturevalue("service")
     
     # Track overall accuracy metrics
     total_docs = 0
@@ -18,57 +41,48 @@ async def test_labeled_documents(labeled_documents_dir, document_metadata, test_
     correct_clients = 0
     correct_states = 0
     
-    # Process each document in the labeled directory
-    for doc_type in ["approvals", "denials", "requests"]:
-        doc_dir = labeled_documents_dir / doc_type
-        if not doc_dir.exists():
-            continue
-            
-        for pdf_file in doc_dir.glob("*.pdf"):
-            if pdf_file.name not in document_metadata:
-                print(f"Warning: No metadata found for {pdf_file.name}")
-                continue
-                
-            total_docs += 1
-            expected = document_metadata[pdf_file.name]
-            
-            # Extract text from PDF
-            with open(pdf_file, "rb") as f:
-                pdf_bytes = f.read()
-            document_text = extract_text_from_attachment(pdf_bytes, "pdf")
-            
-            # Classify the document
-            result = await service.classify_document(document_text)
+    # Extract text from each labeled document in the labeled directory
+    labeled = [
+        (pdf_file, _extract_pdf_text(pdf_file))
+        for pdf_file in _iter_labeled_pdfs(labeled_documents_dir, document_metadata)
+    ]
             
-            # Compare with expected results
-            if result.document_type == expected["document_type"]:
-                correct_types += 1
-            if result.entities["companies"] == expected["expected_entities"]["companies"]:
-                correct_clients += 1
-            if result.entities["states"] == expected["expected_entities"]["states"]:
-                correct_states += 1
-                
-            # Print detailed results for this document
-            print(f"\nResults for {pdf_file.name}:")
-            print(f"Document Type: {result.document_type} (Expected: {expected['document_type']})")
-            print(f"Client: {result.entities['companies']} (Expected: {expected['expected_entities']['companies']})")
-            print(f"State: {result.entities['states']} (Expected: {expected['expected_entities']['states']})")
-            print(f"Confidence: {result.confidence}")
-            
-            # Assert key expectations
-            assert result.confidence >= 0.5, f"Low confidence ({result.confidence}) for {pdf_file.name}"
-            
-            # Check for required fields
-            assert result.document_type is not None, f"Missing document type for {pdf_file.name}"
-            assert result.entities["companies"], f"No companies found for {pdf_file.name}"
-            assert result.entities["states"], f"No states found for {pdf_file.name}"
+    # Classify all documents concurrently
+    results = await service.classify_batch([text for _, text in labeled], source_type="text")
+    
+    for (pdf_file, _), result in zip(labeled, results):
+        total_docs += 1
+        expected = document_metadata[pdf_file.name]
+        
+        # Compare with expected results
+        if result.document_type == expected["document_type"]:
+            correct_types += 1
+        if result.entities["companies"] == expected["expected_entities"]["companies"]:
+            correct_clients += 1
+        if result.entities["states"] == expected["expected_entities"]["states"]:
+            correct_states += 1
             
-            # Verify key fields are present if expected
-            if "expected_key_fields" in expected:
-                for field_type, expected_values in expected["expected_key_fields"].items():
-                    if expected_values:
-                        assert result.key_fields.get(field_type), \
-                            f"Missing expected key field {field_type} in {pdf_file.name}"
+        # Print detailed results for this document
+        print(f"\nResults for {pdf_file.name}:")
+        print(f"Document Type: {result.document_type} (Expected: {expected['document_type']})")
+        print(f"Client: {result.entities['companies']} (Expected: {expected['expected_entities']['companies']})")
+        print(f"State: {result.entities['states']} (Expected: {expected['expected_entities']['states']})")
+        print(f"Confidence: {result.confidence}")
+        
+        # Assert key expectations
+        assert result.confidence >= 0.5, f"Low confidence ({result.confidence}) for {pdf_file.name}"
+        
+        # Check for required fields
+        assert result.document_type is not None, f"Missing document type for {pdf_file.name}"
+        assert result.entities["companies"], f"No companies found for {pdf_file.name}"
+        assert result.entities["states"], f"No states found for {pdf_file.name}"
+        
+        # Verify key fields are present if expected
+        if "expected_key_fields" in expected:
+            for field_type, expected_values in expected["expected_key_fields"].items():
+                if expected_values:
+                    assert result.key_fields.get(field_type), \
+                        f"Missing expected key field {field_type} in {pdf_file.name}"
     
     # Print overall accuracy metrics
     if total_docs > 0:
@@ -80,7 +94,7 @@ async def test_labeled_documents(labeled_documents_dir, document_metadata, test_
         print("\nNo labeled documents found to test.")
 
 @pytest.mark.asyncio
-async def test_specific_document(labeled_documents_dir, document_metadata, test_config_dir):
+async def test_specific_document(labeled_documents_dir, document_metadata, service):
     """
     Test a specific labeled document. Useful for debugging classification issues.
     Set the DOC_NAME environment variable to test a specific document.
@@ -88,8 +102,6 @@ async def test_specific_document(labeled_documents_dir, document_metadata, test_
     doc_name = os.getenv("DOC_NAME")
     if not doc_name:
         pytest.skip("No document specified. Set DOC_NAME environment variable to test a specific document.")
-        
-    service = ClassificationService(config_dir=test_config_dir)
     
     # Find the document
     pdf_file = None
@@ -106,10 +118,8 @@ async def test_specific_document(labeled_documents_dir, document_metadata, test_
         pytest.fail(f"No metadata found for {doc_name}")
         
     # Extract and classify
-    with open(pdf_file, "rb") as f:
-        pdf_bytes = f.read()
-    document_text = extract_text_from_attachment(pdf_bytes, "pdf")
-    result = await service.classify_document(document_text)
+    document_text = _extract_pdf_text(pdf_file)
+    result = await service.classify_document(document_text, source_type="text")
     
     # Print detailed results
     print(f"\nDetailed results for {doc_name}:")
@@ -133,4 +143,27 @@ async def test_specific_document(labeled_documents_dir, document_metadata, test_
     assert set(result.entities["companies"]) == set(expected["expected_entities"]["companies"]), \
         "Company mismatch"
     assert set(result.entities["states"]) == set(expected["expected_entities"]["states"]), \
-        "State mismatch" 
\ No newline at end of file
+        "State mismatch" 
+
+def test_iter_labeled_pdfs(tmp_path):
+    """Only PDFs directly inside a document type folder and listed in the metadata are used."""
+    for rel in [
+        "approvals/listed.pdf",
+        "approvals/unlisted.pdf",
+        "approvals/nested/listed_nested.pdf",
+        "denials/denied.pdf",
+        "renewals/renewal.pdf",
+        "requests/notes.txt",
+        "top_level.pdf",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    metadata = {
+        name: {}
+        for name in ["listed.pdf", "listed_nested.pdf", "denied.pdf", "renewal.pdf", "top_level.pdf"]
+    }
+    
+    found = sorted(p.relative_to(tmp_path).as_posix() for p in _iter_labeled_pdfs(tmp_path, metadata))
+    
+    assert found == ["approvals/listed.pdf", "denials/denied.pdf"]
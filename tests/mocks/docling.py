@@ -1,22 +1,15 @@
 """Mock Docling package for testing."""
 from typing import List, Dict, Any
 
-class DocProcessor:
-    """Mock DocProcessor class."""
-    
-    def __init__(self, model_path=None):
-        self.model_path = model_path
-    
-    def process_document(self, file_path):
-        """Mock document processing."""
-        return MockDocument()
+_ENTITIES = {
+    "ORG": ("Test Corp",),
+    "PRODUCT": ("Test Product",)
+}
 
-class TableFormer:
-    """Mock TableFormer class."""
-    
-    def extract_tables(self, doc):
-        """Mock table extraction."""
-        return []
+_PATTERNS = {
+    r"REG-?\d+|LIC-?\d+": ("REG-12345",),
+    r"\$?\d+(?:,\d{3})*(?:\.\d{2})?": ("$1000.00",)
+}
 
 class MockDocument:
     """Mock Document class."""
@@ -25,21 +18,13 @@ class MockDocument:
         return "Test document for registration in California"
     
     def extract_entities(self, entity_type: str) -> List[str]:
-        entities = {
-            "ORG": ["Test Corp"],
-            "PRODUCT": ["Test Product"]
-        }
-        return entities.get(entity_type, [])
+        return list(_ENTITIES.get(entity_type, ()))
     
     def extract_dates(self) -> List[str]:
         return ["2024-02-11"]
     
     def extract_patterns(self, pattern: str) -> List[str]:
-        patterns = {
-            r"REG-?\d+|LIC-?\d+": ["REG-12345"],
-            r"\$?\d+(?:,\d{3})*(?:\.\d{2})?": ["$1000.00"]
-        }
-        return patterns.get(pattern, [])
+        return list(_PATTERNS.get(pattern, ()))
     
     @property
     def page_count(self) -> int:
@@ -54,4 +39,24 @@ class MockDocument:
         return 0.95
     
     def get_summary(self) -> str:
-        return "Test document summary" 
\ No newline at end of file
+        return "Test document summary"
+
+class DocProcessor:
+    """Mock DocProcessor class."""
+    
+    # Mock documents are stateless, so every call can share one
+    _DOC = MockDocument()
+    
+    def __init__(self, model_path=None):
+        self.model_path = model_path
+    
+    def process_document(self, file_path):
+        """Mock document processing."""
+        return self._DOC
+
+class TableFormer:
+    """Mock TableFormer class."""
+    
+    def extract_tables(self, doc):
+        """Mock table extraction."""
+        return []
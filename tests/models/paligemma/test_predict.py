@@ -6,6 +6,7 @@ import io
 import os
 from src.models.paligemma.predict import (
     _resize_image,
+    _warmup,
     encode_image,
     make_prediction,
 )
@@ -106,6 +107,24 @@ def test_make_prediction_failure(mock_endpoint):
     assert mock_endpoint.predict.call_count == 1  # Only initial attempt
 
 
+@patch("src.models.paligemma.predict.endpoint")
+def test_warmup_sends_tiny_prediction(mock_endpoint):
+    # Test warmup issues a single minimal prediction
+    _warmup(delay=0)
+    mock_endpoint.predict.assert_called_once()
+    (instance,) = mock_endpoint.predict.call_args.kwargs["instances"]
+    assert instance["max_tokens"] == 1
+    assert base64.b64decode(instance["image"])
+
+
+@patch("src.models.paligemma.predict.endpoint")
+def test_warmup_swallows_errors(mock_endpoint):
+    # Test warmup failures never propagate
+    mock_endpoint.predict.side_effect = Exception("Cold start error")
+    _warmup(delay=0)
+    assert mock_endpoint.predict.call_count == 1
+
+
 def test_environment_variables():
     # Test required environment variables are set
     required_vars = ["PROJECT_ID", "ENDPOINT_ID", "REGION"]
@@ -1,6 +1,8 @@
+import json
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
+from src.services import audit_service as audit_module
 from src.services.audit_service import AuditService
 
 @pytest.fixture
@@ -125,4 +127,33 @@ async def test_get_error_statistics(audit_service, mock_storage):
     
     # Verify
     assert stats == mock_stats
-    mock_storage.get_error_statistics.assert_called_once()
\ No newline at end of file
+    mock_storage.get_error_statistics.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_log_error_serialized(mock_storage):
+    # Setup
+    audit_service = AuditService(storage_service=mock_storage, serialize_records=True)
+    error = ValueError("Test error")
+    
+    # Execute
+    await audit_service.log_error("test123", error)
+    
+    # Verify
+    mock_storage.store_audit_log.assert_not_called()
+    payload = mock_storage.store_audit_log_bytes.call_args[0][0]
+    record = json.loads(payload)
+    assert record["message_id"] == "test123"
+    assert record["error_type"] == "ValueError"
+
+def test_now_iso_cached_per_second():
+    # 2024-02-11T10:00:00Z
+    with patch.object(audit_module.time, 'time', return_value=1707645600.25):
+        first = audit_module._now_iso()
+    with patch.object(audit_module.time, 'time', return_value=1707645600.75):
+        assert audit_module._now_iso() is first
+    with patch.object(audit_module.time, 'time', return_value=1707645601.0):
+        later = audit_module._now_iso()
+    
+    assert first == "2024-02-11T10:00:00"
+    assert later == "2024-02-11T10:00:01"
+    assert audit_module._ts_cache == (1707645601, later)
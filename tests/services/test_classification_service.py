@@ -1,6 +1,10 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.classifiers.base import ClassificationResult
 from src.services.classification_service import ClassificationService
 
 @pytest.fixture
@@ -40,4 +44,59 @@ async def test_priority_determination():
 @pytest.mark.asyncio
 async def test_classification_accuracy_tracking():
     # TODO: Implement once ClassificationService is implemented
-    pass
\ No newline at end of file
+    pass
+
+@pytest.fixture
+def mock_classifier():
+    with patch('src.services.classification_service.ClassifierFactory.create_classifier') as create:
+        yield create.return_value
+
+@pytest.mark.asyncio
+async def test_classify_batch_columnar(mock_classifier):
+    mock_classifier.classify_batch = AsyncMock(return_value=[
+        ClassificationResult(
+            document_type="license",
+            client_code="ARB",
+            confidence=0.9,
+            entities={"companies": ["ARB"], "states": ["AL"]},
+            key_fields={"registration_numbers": ["LIC-2024-001"]},
+            metadata={},
+            summary=None,
+            flags=[]
+        ),
+        ClassificationResult(
+            document_type=None,
+            client_code=None,
+            confidence=0.2,
+            entities={},
+            key_fields={},
+            metadata={},
+            summary=None,
+            flags=["LOW_CONFIDENCE"]
+        )
+    ])
+    service = ClassificationService()
+    
+    batch = await service.classify_batch_columnar(["first", "second"], source_type="text")
+    
+    mock_classifier.classify_batch.assert_awaited_once_with(["first", "second"], "text", None, 5)
+    assert len(batch) == 2
+    assert batch.document_types == ["license", None]
+    assert batch.entity_counts.tolist() == [2, 0]
+    assert batch.low_confidence().tolist() == [1]
+
+@pytest.mark.asyncio
+async def test_classify_email_part_without_payload(mock_classifier):
+    mock_classifier.classify_document = AsyncMock(return_value=MagicMock())
+    email_message = MIMEMultipart()
+    email_message["subject"] = "Renewal"
+    # A text/plain part with no payload decodes to None
+    email_message.attach(Message())
+    email_message.attach(MIMEText("Renewal reminder"))
+    service = ClassificationService()
+    
+    results = await service.classify_email(email_message)
+    
+    assert len(results) == 1
+    mock_classifier.classify_document.assert_awaited_once()
+    assert mock_classifier.classify_document.call_args[0][0] == "Renewal reminder"
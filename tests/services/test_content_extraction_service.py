@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.services.content_extraction_service import ContentExtractionService
@@ -30,10 +33,11 @@ def mock_genai():
         yield mock
 
 @pytest.fixture
-def content_extraction_service(mock_genai, mock_response):
+def content_extraction_service(mock_genai, mock_response, tmp_path):
     with patch('google.generativeai.GenerativeModel.generate_content', return_value=mock_response):
-        service = ContentExtractionService(api_key="test_key")
+        service = ContentExtractionService(api_key="test_key", cache_path=tmp_path / "cache.db")
         yield service
+        service.close()
 
 @pytest.mark.asyncio
 async def test_extract_content(content_extraction_service, mock_response, tmp_path):
@@ -91,4 +95,205 @@ async def test_error_handling(content_extraction_service, tmp_path):
         mock_generate.return_value = MagicMock(text="Invalid JSON")
         with pytest.raises(Exception) as exc_info:
             await content_extraction_service.extract_content(test_file)
-        assert "Failed to parse" in str(exc_info.value)
\ No newline at end of file
+        assert "Failed to parse" in str(exc_info.value)
+
+@pytest.mark.asyncio
+async def test_extract_content_cache(content_extraction_service, tmp_path):
+    # Create two byte-identical files
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    first.write_bytes(b"Duplicate content")
+    second.write_bytes(b"Duplicate content")
+    
+    with patch.object(content_extraction_service.model, 'generate_content',
+                      wraps=content_extraction_service.model.generate_content) as mock_generate:
+        first_result = await content_extraction_service.extract_content(first)
+        second_result = await content_extraction_service.extract_content(second)
+    
+    # Identical documents should only reach Gemini once
+    assert mock_generate.call_count == 1
+    assert first_result == second_result
+
+@pytest.mark.asyncio
+async def test_batch_extract_overlaps_requests(content_extraction_service, mock_response, tmp_path):
+    # Each call waits for the other to start, so serialized calls break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def generate_content(*args, **kwargs):
+        barrier.wait()
+        return mock_response
+    
+    files = []
+    for i in range(2):
+        test_file = tmp_path / f"test_{i}.pdf"
+        test_file.write_bytes(f"Test content {i}".encode())
+        files.append(test_file)
+    
+    with patch.object(content_extraction_service.model, 'generate_content',
+                      side_effect=generate_content):
+        results = await content_extraction_service.batch_extract(files, max_concurrent=2)
+    
+    assert all(result["success"] for result in results), results
+
+@pytest.mark.asyncio
+async def test_extract_as_completed(content_extraction_service, tmp_path):
+    # Create test files, one of them missing
+    files = []
+    for i in range(3):
+        test_file = tmp_path / f"test_{i}.pdf"
+        test_file.write_bytes(b"Test content")
+        files.append(test_file)
+    files.append(tmp_path / "missing.pdf")
+    
+    results = {}
+    async for index, result in content_extraction_service.extract_as_completed(files, max_concurrent=2):
+        results[index] = result
+    
+    # Every input should be reported once, failures included
+    assert sorted(results) == [0, 1, 2, 3]
+    assert all(results[i]["success"] for i in range(3))
+    assert not results[3]["success"]
+    assert "File not found" in results[3]["error"]
+
+@pytest.mark.asyncio
+async def test_batched_extraction(mock_genai, mock_response, tmp_path):
+    # Gemini returns one result per document in a single response
+    single = json.loads(mock_response.text)
+    batched_response = MagicMock(text=json.dumps({"results": [single] * 3}))
+    
+    with patch('google.generativeai.GenerativeModel.generate_content',
+               return_value=batched_response) as mock_generate:
+        service = ContentExtractionService(
+            api_key="test_key",
+            cache_path=":memory:",
+            max_batch_size=3,
+            max_latency_ms=200
+        )
+        
+        files = []
+        for i in range(3):
+            test_file = tmp_path / f"test_{i}.pdf"
+            test_file.write_bytes(f"Test content {i}".encode())
+            files.append(test_file)
+        
+        results = await asyncio.gather(*[service.extract_content(f) for f in files])
+        await service.aclose()
+    
+    # All three documents should share one Gemini call
+    assert mock_generate.call_count == 1
+    parts = mock_generate.call_args[0][0][0]['parts']
+    assert len(parts) == 4
+    assert all(r["document_type"] == "registration" for r in results)
+
+@pytest.mark.asyncio
+async def test_batches_dispatched_concurrently(mock_genai, mock_response, tmp_path):
+    # Two full batches must be in flight together to pass the barrier
+    single = json.loads(mock_response.text)
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def generate_content(*args, **kwargs):
+        barrier.wait()
+        return MagicMock(text=json.dumps({"results": [single] * 2}))
+    
+    with patch('google.generativeai.GenerativeModel.generate_content',
+               side_effect=generate_content) as mock_generate:
+        service = ContentExtractionService(
+            api_key="test_key",
+            cache_path=":memory:",
+            max_batch_size=2,
+            max_latency_ms=200
+        )
+        
+        files = []
+        for i in range(4):
+            test_file = tmp_path / f"test_{i}.pdf"
+            test_file.write_bytes(f"Test content {i}".encode())
+            files.append(test_file)
+        
+        results = await asyncio.gather(*[service.extract_content(f) for f in files])
+        await service.aclose()
+    
+    assert mock_generate.call_count == 2
+    assert all(r["document_type"] == "registration" for r in results)
+
+@pytest.mark.asyncio
+async def test_batcher_aclose_fails_pending(mock_genai, tmp_path):
+    service = ContentExtractionService(
+        api_key="test_key",
+        cache_path=":memory:",
+        max_batch_size=8,
+        max_latency_ms=10000
+    )
+    test_file = tmp_path / "test.pdf"
+    test_file.write_bytes(b"Test content")
+    
+    # The request waits in the batch window until the batcher is closed
+    pending = asyncio.create_task(service.extract_content(test_file))
+    while not service.batcher._pending:
+        await asyncio.sleep(0)
+    await service.aclose()
+    
+    with pytest.raises(Exception, match="batcher closed"):
+        await pending
+    assert service.batcher._worker is None
+
+def test_read_file_blob_raw_bytes(content_extraction_service, tmp_path):
+    # Blob data is the raw file content; the SDK handles encoding
+    payload = bytes(range(256)) * 1000 + b"xy"
+    test_file = tmp_path / "large.pdf"
+    test_file.write_bytes(payload)
+    
+    blob = content_extraction_service._read_file_blob(test_file)
+    
+    assert blob["mime_type"] == "application/pdf"
+    assert blob["data"] == payload
+
+def test_model_shared_across_services(content_extraction_service):
+    # Services created with the same key reuse one model instance
+    with patch('src.services.content_extraction_service.genai.configure') as mock_configure:
+        other = ContentExtractionService(api_key="test_key", cache_path=":memory:")
+        assert other.model is content_extraction_service.model
+        mock_configure.assert_not_called()
+        
+        # A new key reconfigures the process and replaces the shared model
+        different = ContentExtractionService(api_key="other_key", cache_path=":memory:")
+        mock_configure.assert_called_once_with(api_key="other_key")
+        assert different.model is not content_extraction_service.model
+        
+        # Switching back configures the original key again
+        again = ContentExtractionService(api_key="test_key", cache_path=":memory:")
+        assert mock_configure.call_args.kwargs == {"api_key": "test_key"}
+        assert again.model is not different.model
+
+@pytest.mark.asyncio
+async def test_extract_content_cache_persists(mock_genai, mock_response, tmp_path):
+    test_file = tmp_path / "test.pdf"
+    test_file.write_bytes(b"Test content")
+    cache_path = tmp_path / "cache.db"
+    
+    with patch('google.generativeai.GenerativeModel.generate_content',
+               return_value=mock_response) as mock_generate:
+        first = ContentExtractionService(api_key="test_key", cache_path=cache_path)
+        await first.extract_content(test_file)
+        first.close()
+        
+        # A new service reading the same file serves the result from disk
+        second = ContentExtractionService(api_key="test_key", cache_path=cache_path)
+        result = await second.extract_content(test_file)
+        second.close()
+    
+    assert mock_generate.call_count == 1
+    assert result["document_type"] == "registration"
+
+def test_cache_evicts_least_recently_used(content_extraction_service):
+    content_extraction_service.cache_size = 2
+    content_extraction_service._cache_put(b"a", b"{}")
+    content_extraction_service._cache_put(b"b", b"{}")
+    
+    # Reading "a" makes "b" the least recently used entry
+    assert content_extraction_service._cache_get(b"a") == b"{}"
+    content_extraction_service._cache_put(b"c", b"{}")
+    
+    assert content_extraction_service._cache_get(b"b") is None
+    assert content_extraction_service._cache_get(b"a") == b"{}"
+    assert content_extraction_service._cache_get(b"c") == b"{}"
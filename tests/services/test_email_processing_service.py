@@ -9,6 +9,7 @@ This test suite verifies the email processing pipeline's functionality, includin
 - Audit logging of processing events
 """
 
+import asyncio
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -171,7 +172,7 @@ async def test_process_new_emails_batch(email_processing_service, mock_services)
                  subject=f"Test Email {i}") 
         for i in range(3)
     ]
-    mock_services['gmail_client'].get_unread_inbox.return_value = messages
+    mock_services['gmail_client'].iter_unread_inbox.return_value = iter([messages])
     mock_services['security_service'].verify_email.return_value = SecurityVerificationResult(
         is_safe=True,
         checks_passed=['sender_verification', 'content_safety'],
@@ -187,9 +188,86 @@ async def test_process_new_emails_batch(email_processing_service, mock_services)
     assert len(results) == 3, "All emails in batch should be processed"
     assert all(r.status == ProcessingStatus.COMPLETED for r in results), \
            "All emails should complete processing"
-    assert mock_services['gmail_client'].get_unread_inbox.call_count == 1, \
+    assert mock_services['gmail_client'].iter_unread_inbox.call_count == 1, \
            "Inbox should be queried exactly once"
 
+@pytest.mark.asyncio
+async def test_process_new_emails_isolates_failures(email_processing_service, mock_services):
+    """
+    Test that an exception escaping one email does not abort the batch.
+    
+    Emails are processed concurrently; a message whose pipeline raises is
+    reported as FAILED while the others still complete.
+    """
+    messages = [
+        MagicMock(spec=Message, id=f"test_email_{i}",
+                 sender=f"test{i}@example.com",
+                 subject=f"Test Email {i}")
+        for i in range(3)
+    ]
+    mock_services['gmail_client'].iter_unread_inbox.return_value = iter([messages])
+    mock_services['security_service'].verify_email.return_value = SecurityVerificationResult(
+        is_safe=True,
+        checks_passed=['sender_verification', 'content_safety'],
+        checks_failed=[],
+        scan_date=datetime.utcnow(),
+        threat_level='low'
+    )
+    
+    original = email_processing_service.process_email
+    
+    async def flaky_process(message):
+        if message.id == "test_email_1":
+            raise RuntimeError("boom")
+        return await original(message)
+    
+    with patch.object(email_processing_service, 'process_email', side_effect=flaky_process):
+        results = await email_processing_service.process_new_emails()
+    
+    assert [r.email_id for r in results] == ["test_email_0", "test_email_1", "test_email_2"]
+    assert [r.status for r in results] == [
+        ProcessingStatus.COMPLETED, ProcessingStatus.FAILED, ProcessingStatus.COMPLETED
+    ]
+    assert results[1].error == "boom"
+
+@pytest.mark.asyncio
+async def test_process_new_emails_fetch_failure_stops_workers(email_processing_service, mock_services):
+    """
+    Test that a failed page fetch cancels workers instead of orphaning them.
+    
+    The first page is queued and picked up by workers; the second page raises.
+    The batch fails, and no worker keeps processing after the error.
+    """
+    messages = [
+        MagicMock(spec=Message, id=f"test_email_{i}",
+                 sender=f"test{i}@example.com",
+                 subject=f"Test Email {i}")
+        for i in range(3)
+    ]
+    
+    def pages():
+        yield messages
+        raise RuntimeError("page fetch failed")
+    
+    mock_services['gmail_client'].iter_unread_inbox.return_value = pages()
+    started = []
+    finished = []
+    
+    async def slow_process(message):
+        started.append(message.id)
+        await asyncio.sleep(1)
+        finished.append(message.id)
+    
+    with patch.object(email_processing_service, 'process_email', side_effect=slow_process):
+        with pytest.raises(RuntimeError, match="page fetch failed"):
+            await email_processing_service.process_new_emails()
+        await asyncio.sleep(0)
+        remaining = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    
+    assert not remaining, "Workers should be cancelled when fetching fails"
+    assert finished == []
+    mock_services['notification_service'].send_error.assert_called_once()
+
 @pytest.mark.asyncio
 async def test_retry_logic(email_processing_service, mock_services, sample_message):
     """
@@ -251,4 +329,58 @@ async def test_get_processing_state(email_processing_service, sample_message):
     assert state.metadata["sender"] == sample_message.sender, \
            "Metadata should include sender information"
     assert state.metadata["subject"] == sample_message.subject, \
-           "Metadata should include email subject"
\ No newline at end of file
+           "Metadata should include email subject"
+
+@pytest.mark.asyncio
+async def test_processing_queue_evicts_oldest(mock_services):
+    """
+    Test that tracked processing states are capped.
+    
+    Once more than max_tracked_states emails have been processed, the
+    oldest states are dropped so long-running services stay bounded.
+    """
+    service = EmailProcessingService(
+        **mock_services, max_tracked_states=2
+    )
+    mock_services['security_service'].verify_email.return_value = SecurityVerificationResult(
+        is_safe=True,
+        checks_passed=['sender_verification', 'content_safety'],
+        checks_failed=[],
+        scan_date=datetime.utcnow(),
+        threat_level='low'
+    )
+    
+    for i in range(3):
+        message = MagicMock(spec=Message, id=f"test_email_{i}",
+                            sender=f"test{i}@example.com",
+                            subject=f"Test Email {i}")
+        await service.process_email(message)
+    
+    assert await service.get_processing_state("test_email_0") is None
+    assert list(service.processing_queue) == ["test_email_1", "test_email_2"]
+
+@pytest.mark.asyncio
+async def test_retry_reuses_extracted_content(email_processing_service, mock_services, sample_message):
+    """
+    Test that a retried email does not extract its content again.
+    
+    The first attempt fails after extraction; the second attempt reuses
+    the cached content, and the cache entry is dropped once it completes.
+    """
+    mock_services['security_service'].verify_email.return_value = SecurityVerificationResult(
+        is_safe=True,
+        checks_passed=['sender_verification', 'content_safety'],
+        checks_failed=[],
+        scan_date=datetime.utcnow(),
+        threat_level='low'
+    )
+    mock_services['content_extraction_service'].extract_content.return_value = {"text": "test content"}
+    mock_services['classification_service'].classify.side_effect = [Exception("Test error"), {"type": "certificate"}]
+    
+    first = await email_processing_service.process_email(sample_message)
+    second = await email_processing_service.process_email(sample_message)
+    
+    assert first.status == ProcessingStatus.FAILED
+    assert second.status == ProcessingStatus.COMPLETED
+    mock_services['content_extraction_service'].extract_content.assert_called_once_with(sample_message)
+    assert sample_message.id not in email_processing_service._extraction_cache
@@ -9,9 +9,11 @@ This test suite verifies the email security verification system, including:
 - Security policy enforcement
 """
 
+import re
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from src.services.security_service import SecurityService
+from src.services import security_service as security_module
+from src.services.security_service import SecurityService, find_suspicious_pattern
 
 @pytest.fixture
 def mock_audit_service():
@@ -82,6 +84,30 @@ async def test_verify_email_suspicious_sender(security_service, sample_message,
     mock_audit_service.log_security_event.assert_called_once(), \
         "Security event should be logged for suspicious sender"
 
+@pytest.mark.asyncio
+async def test_verify_email_blocked_sender_short_circuits(
+    security_service, sample_message, mock_audit_service, mock_notification_service
+):
+    """
+    Test that a blocked sender is rejected before any other check runs.
+    
+    Attachments and content are not scanned, no security alert is sent,
+    and the result is marked as short-circuited.
+    """
+    security_service.blocked_senders = frozenset({sample_message.sender})
+    attachment = MagicMock()
+    attachment.filename = "suspicious.exe"
+    sample_message.attachments = [attachment]
+    
+    result = await security_service.verify_email(sample_message)
+    
+    assert not result.is_safe
+    assert result.short_circuit
+    assert result.checks_failed == ["sender_verification"]
+    assert security_service.short_circuit_count == 1
+    mock_audit_service.log_security_event.assert_called_once()
+    mock_notification_service.send_security_alert.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_verify_email_with_attachments(security_service, sample_message):
     """
@@ -192,6 +218,51 @@ async def test_verify_email_suspicious_content(security_service, sample_message,
     mock_audit_service.log_security_event.assert_called_once(), \
         "Security event should be logged for suspicious content"
 
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_find_suspicious_pattern_backends(monkeypatch, use_hyperscan):
+    """
+    Test that the Hyperscan and re scanners report the same patterns.
+    
+    Hyperscan is optional, so the re alternation must give identical
+    results when it is not installed.
+    """
+    if use_hyperscan and security_module._SUSPICIOUS_DB is None:
+        pytest.skip("hyperscan not installed")
+    if not use_hyperscan:
+        monkeypatch.setattr(security_module, "_SUSPICIOUS_DB", None)
+    
+    assert find_suspicious_pattern("Quarterly registration renewal") is None
+    assert find_suspicious_pattern("URGENT: wire transfer needed") == "urgent.{0,200}transfer"
+    assert find_suspicious_pattern("Please reset your Password") is None
+    assert find_suspicious_pattern("Password reset requested") == "password.{0,200}reset"
+    # Patterns do not match across lines
+    assert find_suspicious_pattern("bank\nverify") is None
+
+def test_suspicious_patterns_are_bounded():
+    """Test that no suspicious pattern uses an unbounded wildcard gap."""
+    for pattern in security_module.SUSPICIOUS_PATTERNS:
+        assert not re.search(r'\.[*+]', pattern), \
+            f"Pattern {pattern!r} should bound its gap, e.g. .{{0,200}}"
+
+def test_suspicious_keywords_cover_patterns():
+    """Test that every suspicious pattern is reachable past the keyword gate."""
+    for pattern in security_module.SUSPICIOUS_PATTERNS:
+        assert any(keyword in pattern for keyword in security_module._SUSPICIOUS_KEYWORDS), \
+            f"Pattern {pattern!r} has no keyword in _SUSPICIOUS_KEYWORDS"
+
+@pytest.mark.parametrize("sender", [
+    "test@example.com",
+    "Test User <test@example.com>",
+    "a@b@example.com",
+    "no-at-sign.example.com",
+    "trailing@",
+])
+def test_extract_domain_matches_regex(sender):
+    """Test that the rpartition fast path agrees with the sender domain regex."""
+    match = security_module._SENDER_DOMAIN_RE.search(sender)
+    expected = match.group(1) if match else None
+    assert security_module._extract_domain(sender) == expected
+
 @pytest.mark.asyncio
 async def test_verify_email_multiple_issues(security_service, sample_message, mock_audit_service):
     """
@@ -0,0 +1,29 @@
+import pytest
+from src.services.audit_service import AuditService
+from src.services.storage_service import StorageService
+
+@pytest.fixture
+def storage_service(tmp_path):
+    return StorageService(audit_log_path=tmp_path / "audit_log.jsonl")
+
+@pytest.mark.asyncio
+async def test_store_audit_log_bytes(storage_service):
+    await storage_service.store_audit_log_bytes(b'{"message_id":"test123","event_type":"error"}')
+    await storage_service.store_audit_log({"message_id": "other", "event_type": "success"})
+    
+    records = await storage_service.get_audit_logs_by_message("test123")
+    
+    assert records == [{"message_id": "test123", "event_type": "error"}]
+    assert storage_service.audit_log_path.read_bytes().count(b"\n") == 2
+
+@pytest.mark.asyncio
+async def test_serialized_audit_records(storage_service):
+    # Records encoded by the audit service are stored without a re-decode
+    audit_service = AuditService(storage_service=storage_service, serialize_records=True)
+    
+    await audit_service.log_error("test123", ValueError("Test error"))
+    
+    records = await storage_service.get_audit_logs_by_message("test123")
+    assert len(records) == 1
+    assert records[0]["event_type"] == "error"
+    assert records[0]["error_type"] == "ValueError"
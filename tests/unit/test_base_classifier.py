@@ -1,6 +1,6 @@
 import pytest
 from pathlib import Path
-from src.classifiers.base import BaseDocumentClassifier, ClassificationResult
+from src.classifiers.base import BaseDocumentClassifier, ClassificationBatch, ClassificationResult
 
 def test_classification_result_model():
     """Test the ClassificationResult model validation."""
@@ -72,4 +72,38 @@ def test_client_identification():
         summary=None,
         flags=["UNKNOWN_CLIENT"]
     )
-    assert unknown_client.client_code is None 
\ No newline at end of file
+    assert unknown_client.client_code is None
+
+def test_classification_batch_from_results():
+    """Test building the columnar batch view from classification results."""
+    results = [
+        ClassificationResult(
+            document_type="registration",
+            client_code="EEA",
+            confidence=0.9,
+            entities={"companies": ["Test Corp"], "products": [], "states": ["CA", "NY"]},
+            key_fields={"dates": ["2024-02-11"], "registration_numbers": [], "amounts": []},
+            metadata={},
+            summary=None,
+            flags=[]
+        ),
+        ClassificationResult(
+            document_type=None,
+            client_code=None,
+            confidence=0.25,
+            entities={"companies": [], "products": [], "states": []},
+            key_fields={"dates": [], "registration_numbers": [], "amounts": []},
+            metadata={},
+            summary=None,
+            flags=["LOW_CONFIDENCE"]
+        )
+    ]
+    
+    batch = ClassificationBatch.from_results(results)
+    
+    assert len(batch) == 2
+    assert batch.entity_counts.tolist() == [3, 0]
+    assert batch.field_counts.tolist() == [1, 0]
+    assert batch.document_types == ["registration", None]
+    assert batch.flags[1] == ["LOW_CONFIDENCE"]
+    assert batch.low_confidence().tolist() == [1]
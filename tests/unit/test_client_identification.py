@@ -130,6 +130,19 @@ def test_client_confidence_scoring(test_client_config):
         if code:
             assert confidence >= min_confidence
 
+def test_client_code_priority(test_client_config):
+    """Test that code matches follow client config order, not text position."""
+    domain_config = DomainConfig(test_client_config)
+    
+    # yaml.dump sorts keys, so ARB precedes EEA in the loaded config
+    code, confidence = domain_config._identify_client("EEA and ARB joint filing")
+    assert code == "ARB"
+    assert confidence == 0.8
+    
+    # Codes only match as whole words
+    code, _ = domain_config._identify_client("ARBITRARY notice")
+    assert code is None
+
 def test_client_identification_with_metadata():
     """Test client identification using document metadata."""
     # Test with email metadata
@@ -1,12 +1,14 @@
 """
 Tests for document helper utilities.
 """
+import json
 import pytest
 from pathlib import Path
 from datetime import datetime
-from ..utils.document_helpers import (
+from tests.utils.document_helpers import (
     parse_document_filename,
     generate_document_metadata,
+    extract_pdf_text,
     update_test_documents
 )
 
@@ -89,4 +91,33 @@ def test_update_test_documents(tmp_path):
     for entry in metadata.values():
         assert "document_type" in entry
         assert "workflow_state" in entry
-        assert "expected_entities" in entry 
\ No newline at end of file
+        assert "expected_entities" in entry 
+
+def _single_page_pdf(text: str) -> bytes:
+    """Build a minimal one-page PDF showing text in Helvetica."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+def test_extract_pdf_text(tmp_path):
+    """Test extracting the text layer of a PDF."""
+    pdf_file = tmp_path / "AL-ARB-NEW.pdf"
+    pdf_file.write_bytes(_single_page_pdf("ARB License Application State of Alabama"))
+    
+    assert extract_pdf_text(pdf_file) == "ARB License Application State of Alabama"
@@ -0,0 +1,57 @@
+"""
+Unit tests for the configuration version checker.
+"""
+import os
+import yaml
+from unittest.mock import patch
+from src.utils.version_checker import VersionChecker
+
+def test_load_config_version_cached_until_modified(tmp_path):
+    """Test that config versions are re-parsed only when the file changes."""
+    version_control = {
+        "version_control": {
+            "min_compatible_version": "1.0.0",
+            "current_versions": {"document_types": "1.0.0"},
+            "migrations_required": {}
+        }
+    }
+    (tmp_path / "version_control.yaml").write_text(yaml.dump(version_control))
+    config_file = tmp_path / "document_types.yaml"
+    config_file.write_text(yaml.dump({"version": "1.0.0"}))
+    checker = VersionChecker(tmp_path)
+    
+    with patch("src.utils.version_checker.yaml.load", wraps=yaml.load) as mock_load:
+        assert checker._load_config_version(config_file) == "1.0.0"
+        assert checker._load_config_version(config_file) == "1.0.0"
+        assert mock_load.call_count == 1
+        
+        config_file.write_text(yaml.dump({"version": "1.1.0"}))
+        # Make sure the change is visible on filesystems with coarse mtimes
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert checker._load_config_version(config_file) == "1.1.0"
+        assert mock_load.call_count == 2
+
+def test_get_required_migrations(tmp_path):
+    """Test that migrations newer than the config version are returned in order."""
+    version_control = {
+        "version_control": {
+            "min_compatible_version": "1.0.0",
+            "current_versions": {"document_types": "2.0.0"},
+            "migrations_required": {
+                "1.0.0": ["initial"],
+                "1.5.0": ["add_fields"],
+                "2.0.0": ["rename_types"]
+            }
+        }
+    }
+    (tmp_path / "version_control.yaml").write_text(yaml.dump(version_control, sort_keys=False))
+    (tmp_path / "document_types.yaml").write_text(yaml.dump({"version": "1.2.0"}))
+    checker = VersionChecker(tmp_path)
+    
+    assert checker.needs_migration("document_types")
+    assert checker.get_required_migrations("document_types") == ["add_fields", "rename_types"]
+    assert checker.check_compatibility() == [
+        "Config document_types.yaml version 1.2.0 does not match expected version 2.0.0"
+    ]
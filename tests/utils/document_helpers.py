@@ -8,6 +8,8 @@ import shutil
 import json
 from typing import Dict, Optional
 
+import PyPDF2
+
 def parse_document_filename(filename: str) -> Dict:
     """
     Parse a document filename following the convention:
@@ -98,6 +100,19 @@ def generate_document_metadata(filename: str,
     
     return metadata
 
+def extract_pdf_text(pdf_file: Path) -> str:
+    """
+    Extract the text of every page in a PDF.
+    
+    Args:
+        pdf_file: Path to the PDF file
+        
+    Returns:
+        Page texts joined by newlines
+    """
+    reader = PyPDF2.PdfReader(str(pdf_file))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
 def update_test_documents(documents_dir: Path, labeled_dir: Path):
     """
     Update test document organization and metadata.